@@ -50,6 +50,8 @@ export class LambdaConstruct extends Construct {
                 RDS_ENDPOINT: props.rdsEndpoint,
                 RDS_PORT: props.rdsPort,
                 DATABASE_NAME: props.databaseName,
+                DB_POOL_MODE: 'lambda',
+                DB_WARMUP_ON_INIT: 'true',
 
                 REDIS_HOST: props.redisEndpoint,
                 REDIS_PORT: props.redisPort,
@@ -2,6 +2,7 @@ import * as cdk from 'aws-cdk-lib';
 import * as events from 'aws-cdk-lib/aws-events';
 import * as sqs from 'aws-cdk-lib/aws-sqs';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
+import * as lambdaEventSources from 'aws-cdk-lib/aws-lambda-event-sources';
 import * as targets from 'aws-cdk-lib/aws-events-targets';
 import * as iam from 'aws-cdk-lib/aws-iam';
 import { Construct } from 'constructs';
@@ -43,14 +44,10 @@ export class WebhooksConstruct extends Construct {
 
         new events.Rule(this, 'WebhookRule', {
             eventBus: this.eventBus,
+            // Every event type is forwarded; the consumer matches them
+            // against each subscription's events.
             eventPattern: {
                 source: ['apiverse'],
-                detailType: [
-                    'schema_change',
-                    'rate_limit_exceeded',
-                    'api_down',
-                    'usage_threshold',
-                ],
             },
             targets: [new targets.SqsQueue(this.webhookQueue)],
         });
@@ -63,6 +60,14 @@ export class WebhooksConstruct extends Construct {
 
         this.webhookQueue.grantSendMessages(props.lambdaFunction);
 
+        // Batches are delivered concurrently by app.main.handler; records that
+        // should be retried are reported back individually.
+        props.lambdaFunction.addEventSource(new lambdaEventSources.SqsEventSource(this.webhookQueue, {
+            batchSize: 50,
+            maxBatchingWindow: cdk.Duration.seconds(5),
+            reportBatchItemFailures: true,
+        }));
+
         cdk.Tags.of(this.eventBus).add('Name', 'ApiVerse-EventBus');
         cdk.Tags.of(this.eventBus).add('Project', 'ApiVerse');
         cdk.Tags.of(this.webhookQueue).add('Name', 'ApiVerse-Webhook-Queue');
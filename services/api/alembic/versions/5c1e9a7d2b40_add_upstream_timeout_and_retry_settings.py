@@ -0,0 +1,42 @@
+"""Add upstream timeout, retry and hedging settings to apis table
+
+Revision ID: 5c1e9a7d2b40
+Revises: 704c41e51e3a
+Create Date: 2026-10-19 09:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d2b40'
+down_revision: Union[str, Sequence[str], None] = '704c41e51e3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('apis', sa.Column('connect_timeout', sa.Float(), server_default='5.0', nullable=False))
+    op.add_column('apis', sa.Column('read_timeout', sa.Float(), server_default='30.0', nullable=False))
+    op.add_column('apis', sa.Column('write_timeout', sa.Float(), server_default='30.0', nullable=False))
+    op.add_column('apis', sa.Column('pool_timeout', sa.Float(), server_default='5.0', nullable=False))
+    op.add_column('apis', sa.Column('max_retries', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('apis', sa.Column('retry_backoff_ms', sa.Integer(), server_default='100', nullable=False))
+    op.add_column('apis', sa.Column('hedging_enabled', sa.Boolean(), server_default='false', nullable=False))
+    op.add_column('apis', sa.Column('hedge_delay_ms', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('apis', 'hedge_delay_ms')
+    op.drop_column('apis', 'hedging_enabled')
+    op.drop_column('apis', 'retry_backoff_ms')
+    op.drop_column('apis', 'max_retries')
+    op.drop_column('apis', 'pool_timeout')
+    op.drop_column('apis', 'write_timeout')
+    op.drop_column('apis', 'read_timeout')
+    op.drop_column('apis', 'connect_timeout')
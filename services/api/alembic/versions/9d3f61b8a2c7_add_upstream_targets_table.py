@@ -0,0 +1,44 @@
+"""Add upstream_targets table and load balancing strategy
+
+Revision ID: 9d3f61b8a2c7
+Revises: 5c1e9a7d2b40
+Create Date: 2026-10-19 10:04:17.226915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f61b8a2c7'
+down_revision: Union[str, Sequence[str], None] = '5c1e9a7d2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('upstream_targets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('api_id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=512), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['api_id'], ['apis.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upstream_targets_id'), 'upstream_targets', ['id'], unique=False)
+    op.create_index(op.f('ix_upstream_targets_api_id'), 'upstream_targets', ['api_id'], unique=False)
+    op.add_column('apis', sa.Column('load_balancing_strategy', sa.String(length=50), server_default='round_robin', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('apis', 'load_balancing_strategy')
+    op.drop_index(op.f('ix_upstream_targets_api_id'), table_name='upstream_targets')
+    op.drop_index(op.f('ix_upstream_targets_id'), table_name='upstream_targets')
+    op.drop_table('upstream_targets')
@@ -0,0 +1,34 @@
+"""Add HTTP/2 and connection pool settings to apis, http_version to usage_metrics
+
+Revision ID: c47b2e913f05
+Revises: 9d3f61b8a2c7
+Create Date: 2026-10-19 11:37:52.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47b2e913f05'
+down_revision: Union[str, Sequence[str], None] = '9d3f61b8a2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('apis', sa.Column('http2_enabled', sa.Boolean(), server_default='false', nullable=False))
+    op.add_column('apis', sa.Column('max_connections', sa.Integer(), server_default='20', nullable=False))
+    op.add_column('apis', sa.Column('max_concurrent_requests', sa.Integer(), nullable=True))
+    op.add_column('usage_metrics', sa.Column('http_version', sa.String(length=10), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('usage_metrics', 'http_version')
+    op.drop_column('apis', 'max_concurrent_requests')
+    op.drop_column('apis', 'max_connections')
+    op.drop_column('apis', 'http2_enabled')
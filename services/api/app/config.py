@@ -1,23 +1,145 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, List, Literal, Optional
 
 class Settings(BaseSettings):
     APP_NAME: str = "APIVerse"
     DEBUG: bool = False
     VERSION: str = "0.1.0"
 
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {}
+    LOG_FORMAT: Literal["json", "text"] = "json"
+    # None: queue logs to a listener thread, except on Lambda (see logger.py).
+    LOG_ASYNC: Optional[bool] = None
+    LOG_PROXY_SAMPLE_RATE: float = 0.1
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 1
+    SERVER_KEEPALIVE_SECONDS: int = 65
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    SERVER_PERIODIC_JOBS_INTERVAL_SECONDS: float = 5.0
+
+    METRICS_ENABLED: bool = True
+    METRICS_MAX_API_LABELS: int = 200
+    METRICS_PUSHGATEWAY_URL: str = ""
+    METRICS_PUSH_INTERVAL_SECONDS: int = 30
+    METRICS_PUSH_JOB: str = "apiverse"
+
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "apiverse-api"
+    TRACING_SAMPLE_RATIO: float = 0.1
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_EXCLUDED_URLS: str = "health,metrics"
+    TRACING_FLUSH_TIMEOUT_MS: int = 2000
+
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_MAX_DEPTH: int = 64
+    PROFILING_MAX_STACKS: int = 5000
+    PROFILING_SINK: str = ""
+    PROFILING_FLUSH_INTERVAL_SECONDS: int = 60
+    PROFILING_CONTROL_REFRESH_SECONDS: float = 5.0
+    PROFILING_MAX_SESSION_SECONDS: int = 3600
+
     DATABASE_URL: str = ""
+    DATABASE_READ_URL: str = ""
+    READ_REPLICA_STALENESS_SECONDS: float = 5.0
+    DB_POOL_MODE: Literal["auto", "queue", "lambda", "null"] = "auto"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_LAMBDA_MAX_OVERFLOW: int = 1
+    DB_SECRET_CACHE_TTL_SECONDS: int = 3600
+    DB_WARMUP_ON_INIT: bool = False
 
     REDIS_HOST: str
     REDIS_PORT: int = 6379
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT_SECONDS: float = 0.1
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
+    REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5.0
+    REDIS_HOT_PATH_CONNECT_TIMEOUT_SECONDS: float = 0.25
+    REDIS_HOT_PATH_TIMEOUT_SECONDS: float = 0.1
 
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRY_IN_MINUTES: int = 60 * 24
 
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 4
+    API_KEY_ARGON2_TIME_COST: int = 3
+    API_KEY_ARGON2_MEMORY_COST_KIB: int = 65536
+    API_KEY_ARGON2_PARALLELISM: int = 4
+    HASHING_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASHING_MAX_WORKERS: int = 2
+    HASHING_MAX_PENDING: int = 32
+
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_USER_CACHE_MAX_SIZE: int = 10000
+    AUTH_TOKEN_CACHE_MAX_SIZE: int = 10000
+
     RDS_SECRET_ARN: str = ""
     AWS_REGION: str = 'eu-west-1'
 
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKER_WINDOW_SECONDS: int = 60
+    CIRCUIT_BREAKER_MIN_REQUESTS: int = 20
+    CIRCUIT_BREAKER_ERROR_RATE: float = 0.5
+    CIRCUIT_BREAKER_TIMEOUT_RATE: float = 0.25
+    CIRCUIT_BREAKER_OPEN_SECONDS: int = 30
+    CIRCUIT_BREAKER_HALF_OPEN_PROBES: int = 1
+    CIRCUIT_BREAKER_LOCAL_CACHE_SECONDS: float = 1.0
+
+    UPSTREAM_EWMA_ALPHA: float = 0.3
+    UPSTREAM_PASSIVE_FAILURE_THRESHOLD: int = 3
+    UPSTREAM_PASSIVE_COOLDOWN_SECONDS: int = 30
+    UPSTREAM_HEALTH_CHECK_ENABLED: bool = False
+    UPSTREAM_HEALTH_CHECK_INTERVAL_SECONDS: int = 10
+    UPSTREAM_HEALTH_CHECK_PATH: str = "/health"
+    UPSTREAM_HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0
+    UPSTREAM_TARGET_CACHE_TTL_SECONDS: float = 5.0
+    UPSTREAM_TARGET_CACHE_MAX_SIZE: int = 10000
+
+    API_KEY_LAST_USED_FLUSH_SECONDS: int = 60
+
+    RATE_LIMIT_FAIL_CLOSED_TIERS: List[str] = []
+
+    RATE_LIMIT_LEASING_ENABLED: bool = False
+    RATE_LIMIT_LEASE_MIN_LIMIT: int = 10000
+    RATE_LIMIT_LEASE_FRACTION: float = 0.02
+    RATE_LIMIT_LEASE_MAX_SIZE: int = 500
+    RATE_LIMIT_LEASE_SECONDS: float = 10.0
+
+    PROXY_COMPRESSION_ENABLED: bool = True
+    PROXY_COMPRESSION_MIN_BYTES: int = 1024
+    PROXY_COMPRESSION_THREADPOOL_BYTES: int = 256 * 1024
+    PROXY_GZIP_LEVEL: int = 6
+    PROXY_BROTLI_QUALITY: int = 4
+    PROXY_ZSTD_LEVEL: int = 3
+
+    WEBHOOK_DELIVERY_CONCURRENCY: int = 20
+    WEBHOOK_DELIVERY_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_RESPONSE_MAX_CHARS: int = 1000
+
+    EVENT_BUS_BACKEND: Literal["eventbridge", "redis", "inprocess"] = "eventbridge"
+    EVENTBRIDGE_BUS_NAME: str = "apiverse-webhooks"
+    EVENTBRIDGE_SOURCE: str = "apiverse"
+    EVENT_STREAM_KEY: str = "webhooks:events"
+    EVENT_STREAM_GROUP: str = "webhook-delivery"
+    EVENT_STREAM_MAXLEN: int = 100000
+    EVENT_STREAM_BLOCK_MS: int = 2000
+    EVENT_QUEUE_MAX_SIZE: int = 10000
+    EVENT_WORKER_ENABLED: bool = True
+    EVENT_BATCH_SIZE: int = 50
+    EVENT_MAX_DELIVERIES: int = 3
+    EVENT_RETRY_DELAY_SECONDS: float = 30.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,50 +1,159 @@
 import os
 import json
-import boto3
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Optional
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.config import get_settings
+from app.utils import tracing
 
 settings = get_settings()
 
 engine = None
 SessionLocal = None
+read_engine = None
+ReadSessionLocal = None
+
+_secrets_client = None
+_cached_secret: Optional[dict] = None
+_secret_fetched_at = 0.0
+_secret_lock = threading.Lock()
+
+def get_secrets_client():
+    global _secrets_client
+    if _secrets_client is None:
+        import boto3
+
+        _secrets_client = boto3.client('secretsmanager')
+    return _secrets_client
+
+def get_database_secret(force_refresh: bool = False) -> dict:
+    global _cached_secret, _secret_fetched_at
+
+    with _secret_lock:
+        expired = time.monotonic() - _secret_fetched_at >= settings.DB_SECRET_CACHE_TTL_SECONDS
+        if _cached_secret is None or expired or force_refresh:
+            response = get_secrets_client().get_secret_value(SecretId=settings.RDS_SECRET_ARN)
+            _cached_secret = json.loads(response['SecretString'])
+            _secret_fetched_at = time.monotonic()
+
+        return _cached_secret
+
+def _rds_url(host: Optional[str]) -> URL:
+    secret = get_database_secret()
+
+    return URL.create(
+        "postgresql",
+        username=secret['username'],
+        password=secret['password'],
+        host=host,
+        port=int(os.environ.get("RDS_PORT", "5432")),
+        database=os.environ.get("DATABASE_NAME", "apiverse")
+    )
 
 def get_database_url():
     if settings.RDS_SECRET_ARN:
-        client = boto3.client('secretsmanager')
-        response = client.get_secret_value(SecretId=settings.RDS_SECRET_ARN)
-        secret = json.loads(response['SecretString'])
-        
-        username = secret['username']
-        password = secret['password']
-        
-        rds_endpoint = os.environ.get("RDS_ENDPOINT")
-        rds_port = os.environ.get("RDS_PORT", "5432")
-        database_name = os.environ.get("DATABASE_NAME", "apiverse")
-        
-        return f"postgresql://{username}:{password}@{rds_endpoint}:{rds_port}/{database_name}"
-        
+        return _rds_url(os.environ.get("RDS_ENDPOINT"))
+
     return settings.DATABASE_URL
 
+def get_read_database_url():
+    if settings.DATABASE_READ_URL:
+        return settings.DATABASE_READ_URL
+
+    read_endpoint = os.environ.get("RDS_READ_ENDPOINT")
+    if settings.RDS_SECRET_ARN and read_endpoint:
+        return _rds_url(read_endpoint)
+
+    return None
+
+def read_replica_configured() -> bool:
+    return bool(settings.DATABASE_READ_URL or (settings.RDS_SECRET_ARN and os.environ.get("RDS_READ_ENDPOINT")))
+
+def get_pool_mode() -> str:
+    if settings.DB_POOL_MODE != "auto":
+        return settings.DB_POOL_MODE
+    return "lambda" if os.environ.get("AWS_LAMBDA_FUNCTION_NAME") else "queue"
+
+def _pool_options() -> dict:
+    pool_mode = get_pool_mode()
+
+    if pool_mode == "null":
+        return {"poolclass": NullPool}
+    if pool_mode == "lambda":
+        return {"pool_size": 1, "max_overflow": settings.DB_LAMBDA_MAX_OVERFLOW}
+    return {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+
+def _is_authentication_error(error: Exception) -> bool:
+    return "password authentication failed" in str(error).lower()
+
+def _register_rotating_credentials(engine):
+    @event.listens_for(engine, "do_connect")
+    def connect_with_current_secret(dialect, connection_record, cargs, cparams):
+        secret = get_database_secret()
+        cparams["user"] = secret['username']
+        cparams["password"] = secret['password']
+
+        try:
+            return dialect.connect(*cargs, **cparams)
+        except dialect.loaded_dbapi.OperationalError as e:
+            if not _is_authentication_error(e):
+                raise
+
+            secret = get_database_secret(force_refresh=True)
+            cparams["user"] = secret['username']
+            cparams["password"] = secret['password']
+            return dialect.connect(*cargs, **cparams)
+
 def init_db():
     global engine, SessionLocal
-    
+
     if engine is None:
         database_url = get_database_url()
         engine = create_engine(
             database_url,
             pool_pre_ping=True,
-            pool_size=5,
-            max_overflow=10
+            **_pool_options()
         )
+        if settings.RDS_SECRET_ARN:
+            _register_rotating_credentials(engine)
+        tracing.instrument_engine(engine)
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def init_read_db():
+    global read_engine, ReadSessionLocal
+
+    if ReadSessionLocal is None:
+        init_db()
+        read_database_url = get_read_database_url()
+
+        if read_database_url is None:
+            ReadSessionLocal = SessionLocal
+            return
+
+        read_engine = create_engine(
+            read_database_url,
+            pool_pre_ping=True,
+            **_pool_options()
+        )
+        if settings.RDS_SECRET_ARN:
+            _register_rotating_credentials(read_engine)
+        tracing.instrument_engine(read_engine)
+        ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+def warm_up():
+    init_db()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
 Base = declarative_base()
 
 def get_db():
-    init_db() 
+    init_db()
     db = SessionLocal()
     try:
         yield db
@@ -1,7 +1,69 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from mangum import Mangum
-from app.routers import auth, apis, api_keys, proxy, rate_limits, analytics, webhooks
+from app.config import get_settings
+from app.routers import admin, auth, apis, api_keys, proxy, rate_limits, analytics, webhooks, upstream_targets
+from app.core import database
+from app.services import api_key_service, profiling_service, webhook_consumer_service
+from app.services.http_client_service import http_client_pool
+from app.services.event_bus_service import event_bus
+from app.services.load_balancer_service import load_balancer
+from app.services.post_response_service import periodic_jobs
+from app.services.quota_lease_service import quota_leases
+from app.services.redis_service import redis_service
+from app.utils import metrics, tracing
+from app.utils.hashing import HashingOverloadedError, hashing_executor
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+periodic_jobs.add_db_job(api_key_service.flush_last_used_if_due)
+periodic_jobs.add_job(metrics.push_if_due)
+periodic_jobs.add_job(quota_leases.release_expired_if_due)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_tasks = []
+
+    await redis_service.connect()
+
+    background_tasks.append(asyncio.create_task(
+        periodic_jobs.run_forever(settings.SERVER_PERIODIC_JOBS_INTERVAL_SECONDS)
+    ))
+    if settings.UPSTREAM_HEALTH_CHECK_ENABLED:
+        background_tasks.append(asyncio.create_task(load_balancer.run_health_checks()))
+    if event_bus.has_worker and settings.EVENT_WORKER_ENABLED:
+        background_tasks.append(asyncio.create_task(
+            event_bus.run_worker(webhook_consumer_service.deliver_messages)
+        ))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    await http_client_pool.close_all()
+    await quota_leases.release_all()
+    await redis_service.aclose()
+    await asyncio.to_thread(flush_last_used_on_shutdown)
+    await asyncio.to_thread(profiling_service.flush_on_shutdown)
+    redis_service.close()
+    hashing_executor.shutdown()
+    tracing.shutdown()
+
+def flush_last_used_on_shutdown():
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        api_key_service.flush_last_used(db)
+    except Exception as e:
+        api_logger.error(f"Failed to flush API key last_used_at on shutdown: {str(e)}")
+    finally:
+        db.close()
 
 app = FastAPI(
     title="APIverse",
@@ -10,7 +72,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
-    root_path="/dev"
+    root_path="/dev",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -21,13 +84,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+tracing.setup_tracing(app)
+
 app.include_router(auth.router)
 app.include_router(apis.router)
+app.include_router(upstream_targets.router)
 app.include_router(api_keys.router)
 app.include_router(rate_limits.router)
 app.include_router(analytics.router)
 app.include_router(webhooks.router)
 app.include_router(proxy.router)
+app.include_router(admin.router)
+
+@app.exception_handler(HashingOverloadedError)
+async def hashing_overloaded_handler(request: Request, exc: HashingOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
 
 @app.get("/health")
 def health_check():
@@ -37,6 +112,14 @@ def health_check():
         "version": "0.1.0"
     }
 
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    if not metrics.enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+
+    content, content_type = metrics.render_latest()
+    return Response(content=content, media_type=content_type)
+
 @app.get("/")
 def root():
     return {
@@ -44,4 +127,22 @@ def root():
         "docs": "/docs"
     }
 
-handler = Mangum(app, lifespan="off")
+if settings.DB_WARMUP_ON_INIT:
+    try:
+        database.warm_up()
+    except Exception as e:
+        api_logger.error(f"Database warm-up failed: {str(e)}")
+
+# Lambda has no process lifecycle to hook: startup work happens lazily and
+# periodic jobs piggyback on requests. `python -m app.server` runs the lifespan.
+http_handler = Mangum(app, lifespan="off")
+
+# The same function receives API Gateway requests and webhook batches from the
+# SQS event source.
+def handler(event, context):
+    try:
+        if webhook_consumer_service.is_sqs_event(event):
+            return webhook_consumer_service.handle_sqs_event(event)
+        return http_handler(event, context)
+    finally:
+        tracing.force_flush()
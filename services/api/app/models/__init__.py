@@ -6,6 +6,7 @@ from app.models.usage_metric import UsageMetric
 from app.models.api_key import APIKey
 from app.models.webhook_subscription import WebhookSubscription
 from app.models.webhook_delivery import WebhookDelivery
+from app.models.upstream_target import UpstreamTarget
 
 __all__ = [
     "User",
@@ -16,4 +17,5 @@ __all__ = [
     "APIKey",
     "WebhookSubscription",
     "WebhookDelivery",
+    "UpstreamTarget",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -15,6 +15,19 @@ class API(Base):
     auth_type = Column(String(50), nullable=False, default="none")
     auth_config = Column(JSON, nullable=True)
 
+    connect_timeout = Column(Float, nullable=False, default=5.0, server_default="5.0")
+    read_timeout = Column(Float, nullable=False, default=30.0, server_default="30.0")
+    write_timeout = Column(Float, nullable=False, default=30.0, server_default="30.0")
+    pool_timeout = Column(Float, nullable=False, default=5.0, server_default="5.0")
+    max_retries = Column(Integer, nullable=False, default=0, server_default="0")
+    retry_backoff_ms = Column(Integer, nullable=False, default=100, server_default="100")
+    hedging_enabled = Column(Boolean, nullable=False, default=False, server_default="false")
+    hedge_delay_ms = Column(Integer, nullable=True)
+    load_balancing_strategy = Column(String(50), nullable=False, default="round_robin", server_default="round_robin")
+    http2_enabled = Column(Boolean, nullable=False, default=False, server_default="false")
+    max_connections = Column(Integer, nullable=False, default=20, server_default="20")
+    max_concurrent_requests = Column(Integer, nullable=True)
+
     is_active = Column(Boolean, default = True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -23,4 +36,5 @@ class API(Base):
     versions = relationship("APIVersion", back_populates="api", cascade="all, delete-orphan")
     rate_limits = relationship("RateLimit", back_populates="api", cascade="all, delete-orphan")
     usage_metrics = relationship("UsageMetric", back_populates="api", cascade="all, delete-orphan")
-    webhook_subscriptions = relationship("WebhookSubscription", back_populates="api", cascade="all, delete-orphan")
\ No newline at end of file
+    webhook_subscriptions = relationship("WebhookSubscription", back_populates="api", cascade="all, delete-orphan")
+    upstream_targets = relationship("UpstreamTarget", back_populates="api", cascade="all, delete-orphan")
\ No newline at end of file
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class UpstreamTarget(Base):
+    __tablename__ = "upstream_targets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    api_id = Column(Integer, ForeignKey("apis.id"), nullable=False, index=True)
+
+    url = Column(String(512), nullable=False)
+    weight = Column(Integer, nullable=False, default=1)
+
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    api = relationship("API", back_populates="upstream_targets")
@@ -13,6 +13,7 @@ class UsageMetric(Base):
     method = Column(String(10), nullable=False)
     status_code = Column(Integer, nullable=False)
     response_time_ms = Column(Float, nullable=False)
+    http_version = Column(String(10), nullable=True)
 
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
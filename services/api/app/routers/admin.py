@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.config import get_settings
+from app.models.user import User
+from app.schemas.profiling import ProfilingSessionRequest, ProfilingSessionResponse, ProfilingStatusResponse
+from app.services.profiling_service import profiling_control, sampler
+from app.utils.dependencies import get_current_superuser
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+def require_profiling_enabled():
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiling is disabled"
+        )
+
+def session_response(session) -> ProfilingSessionResponse:
+    return ProfilingSessionResponse(
+        sample_rate=session["sample_rate"],
+        expires_at=datetime.fromtimestamp(session["expires_at"], tz=timezone.utc)
+    )
+
+@router.get("/profiling", response_model=ProfilingStatusResponse, dependencies=[Depends(require_profiling_enabled)])
+def get_profiling_status(current_user: User = Depends(get_current_superuser)):
+    try:
+        session = profiling_control.get_session()
+    except Exception as e:
+        api_logger.error(f"Redis error reading profiling session: {str(e)}")
+        session = None
+
+    return ProfilingStatusResponse(
+        enabled=settings.PROFILING_ENABLED,
+        default_sample_rate=settings.PROFILING_SAMPLE_RATE,
+        sink=settings.PROFILING_SINK,
+        session=session_response(session) if session else None,
+        **sampler.status()
+    )
+
+@router.put("/profiling", response_model=ProfilingSessionResponse, dependencies=[Depends(require_profiling_enabled)])
+def start_profiling_session(
+    session_data: ProfilingSessionRequest,
+    current_user: User = Depends(get_current_superuser)
+):
+    if session_data.duration_seconds > settings.PROFILING_MAX_SESSION_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"duration_seconds must not exceed {settings.PROFILING_MAX_SESSION_SECONDS}"
+        )
+
+    try:
+        session = profiling_control.start_session(session_data.sample_rate, session_data.duration_seconds)
+    except Exception as e:
+        api_logger.error(f"Failed to start profiling session: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Profiling control unavailable"
+        )
+
+    api_logger.info(
+        f"Profiling session started by user_id={current_user.id}: "
+        f"sample_rate={session_data.sample_rate}, duration={session_data.duration_seconds}s"
+    )
+    return session_response(session)
+
+@router.delete("/profiling", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_profiling_enabled)])
+def stop_profiling_session(current_user: User = Depends(get_current_superuser)):
+    try:
+        profiling_control.stop_session()
+    except Exception as e:
+        api_logger.error(f"Failed to stop profiling session: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Profiling control unavailable"
+        )
+
+    api_logger.info(f"Profiling session stopped by user_id={current_user.id}")
+    return None
+
+@router.get("/profiling/stacks", response_class=PlainTextResponse, dependencies=[Depends(require_profiling_enabled)])
+def get_collapsed_stacks(
+    reset: bool = Query(False),
+    current_user: User = Depends(get_current_superuser)
+):
+    return sampler.collapsed(reset=reset)
+
+@router.post("/profiling/flush", dependencies=[Depends(require_profiling_enabled)])
+def flush_profile(current_user: User = Depends(get_current_superuser)):
+    if not settings.PROFILING_SINK:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No profiling sink configured"
+        )
+
+    return {"shipped": sampler.flush()}
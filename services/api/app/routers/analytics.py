@@ -2,7 +2,6 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional, List
-from app.core.database import get_db
 from app.models.user import User
 from app.schemas.analytics import (
     UsageStatsResponse,
@@ -11,10 +10,11 @@ from app.schemas.analytics import (
     PerformanceStatsResponse
 )
 from app.services import analytics_service
-from app.utils.dependencies import get_current_user
+from app.services.profiling_service import profiled
+from app.utils.dependencies import get_current_user, get_read_db
 from app.utils.logger import api_logger
 
-router = APIRouter(prefix="/analytics", tags=["Analytics"])
+router = APIRouter(prefix="/analytics", tags=["Analytics"], dependencies=[Depends(profiled("analytics"))])
 
 @router.get("/{api_id}/usage", response_model=UsageStatsResponse)
 def get_usage_stats(
@@ -22,7 +22,7 @@ def get_usage_stats(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     api_logger.info(f"Get usage stats for api_id={api_id}, user_id={current_user.id}")
     
@@ -49,7 +49,7 @@ def get_endpoint_stats(
     end_date: Optional[datetime] = Query(None),
     limit: int = Query(10, ge=1, le=100),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     api_logger.info(f"Get endpoint stats for api_id={api_id}, user_id={current_user.id}")
     
@@ -70,7 +70,7 @@ def get_error_stats(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     api_logger.info(f"Get error stats for api_id={api_id}, user_id={current_user.id}")
     
@@ -90,7 +90,7 @@ def get_performance_stats(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     api_logger.info(f"Get performance stats for api_id={api_id}, user_id={current_user.id}")
     
@@ -9,7 +9,7 @@ from app.schemas.api_key import (
     APIKeyListResponse
 )
 from app.services import api_key_service, webhook_service
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import get_current_user, get_read_db
 from app.utils.logger import api_logger
 
 router = APIRouter(prefix="/api-keys", tags=["API Keys"])
@@ -59,7 +59,7 @@ def create_api_key(
 @router.get("", response_model=APIKeyListResponse)
 def list_api_keys(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     api_logger.info(f"Listing API Keys for user: {current_user.id}")
 
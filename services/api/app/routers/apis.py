@@ -10,7 +10,7 @@ from app.schemas.api import (
     APIListResponse
 )
 from app.services import api_service
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import get_current_user, get_read_db
 from app.utils.logger import api_logger
 
 router = APIRouter(prefix="/apis", tags=["API Management"])
@@ -31,7 +31,8 @@ def create_api(
             description=api_data.description,
             base_url=str(api_data.base_url),
             auth_type=api_data.auth_type.value,
-            auth_config=api_data.auth_config
+            auth_config=api_data.auth_config,
+            upstream_settings=api_data.model_dump(mode="json", include=set(api_service.UPSTREAM_SETTINGS))
         )
         return api
     except Exception as e:
@@ -41,7 +42,7 @@ def create_api(
 @router.get("", response_model=APIListResponse)
 def list_apis(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     api_logger.info(f"Listing APIs for user_id: {current_user.id}")
     apis = api_service.get_user_apis(db=db, user=current_user)
@@ -91,7 +92,8 @@ def update_api(
             base_url=str(api_data.base_url) if api_data.base_url else None,
             auth_type=api_data.auth_type.value if api_data.auth_type else None,
             auth_config=api_data.auth_config,
-            is_active=api_data.is_active
+            is_active=api_data.is_active,
+            upstream_settings=api_data.model_dump(mode="json", include=set(api_service.UPSTREAM_SETTINGS), exclude_unset=True)
         )
         return updated_api
     except Exception as e:
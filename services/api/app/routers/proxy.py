@@ -1,22 +1,48 @@
+import base64
 import time
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Header, Request, status
-from fastapi.responses import Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+from app.config import get_settings
 
 from app.core.database import get_db
 from app.models.api_key import APIKey
 from app.models.api import API
 from app.models.usage_metric import UsageMetric
-from app.services import api_key_service, rate_limit_service, webhook_service
-from app.utils.logger import api_logger
+from app.services import api_key_service, rate_limit_service, upstream_service, upstream_target_service, webhook_service
+from app.services.circuit_breaker_service import circuit_breaker
+from app.services.http_client_service import http_client_pool
+from app.services.post_response_service import PostResponsePipeline, get_post_response_pipeline, periodic_jobs
+from app.services.profiling_service import profiled
+from app.utils import compression, metrics
+from app.utils.headers import (
+    RawHeaders,
+    add_vary,
+    build_upstream_headers,
+    filter_response_headers,
+    rate_limit_header_dict,
+    rate_limit_headers,
+    set_header
+)
+from app.utils.logger import api_logger, proxy_logger
 
+settings = get_settings()
 router = APIRouter(prefix="/proxy", tags=["Proxy"])
 
+async def observe_proxy_latency(api_id: int):
+    started = time.perf_counter()
+    yield
+    metrics.observe_request(api_id, time.perf_counter() - started)
+
 async def get_api_key_from_header(
+    api_id: int,
     x_api_key: str = Header(..., description="API Key for authentication"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    pipeline: PostResponsePipeline = Depends(get_post_response_pipeline)
 ) -> APIKey:
     if not x_api_key:
         api_logger.warning("Missing API key in request")
@@ -25,15 +51,18 @@ async def get_api_key_from_header(
             detail="API key is required"
         )
     
-    api_key = api_key_service.verify_api_key(db=db, api_key=x_api_key)
+    with metrics.time_phase("key_verification", api_id):
+        api_key = await api_key_service.verify_api_key(db=db, api_key=x_api_key)
     
     if not api_key:
-        api_logger.warning(f"Invalid or expired API key")
+        api_logger.warning("Invalid or expired API key")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired API key"
         )
     
+    pipeline.add_job(api_key_service.record_last_used, api_key.id)
+    periodic_jobs.piggyback(pipeline)
     return api_key
 
 def track_usage(
@@ -42,67 +71,120 @@ def track_usage(
     endpoint: str,
     method: str,
     status_code: int,
-    response_time_ms: float
+    response_time_ms: float,
+    http_version: Optional[str] = None
 ):
     try:
-        metric = UsageMetric(
-            api_id=api_id,
-            endpoint=endpoint,
-            method=method,
-            status_code=status_code,
-            response_time_ms=response_time_ms
-        )
-        db.add(metric)
-        db.commit()
-        api_logger.info(f"Usage tracked: api_id={api_id}, endpoint={endpoint}, status={status_code}, time={response_time_ms}ms")
+        with metrics.time_phase("metering", api_id):
+            metric = UsageMetric(
+                api_id=api_id,
+                endpoint=endpoint,
+                method=method,
+                status_code=status_code,
+                response_time_ms=response_time_ms,
+                http_version=http_version
+            )
+            db.add(metric)
+            db.commit()
+        proxy_logger.info("Usage tracked: api_id=%s, endpoint=%s, status=%s, time=%.1fms", api_id, endpoint, status_code, response_time_ms)
     except Exception as e:
-        api_logger.error(f"Failed to track usage: {str(e)}")
+        metrics.record_backend_error("db", "track_usage")
+        api_logger.error("Failed to track usage: %s", e)
         db.rollback()
 
-def add_auth_headers(headers: dict, api: API) -> dict:
+def error_response(status_code: int, detail: str, headers: Optional[dict] = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers=headers
+    )
+
+def add_auth_headers(headers: RawHeaders, api: API) -> RawHeaders:
     if api.auth_type == "bearer" and api.auth_config:
         token = api.auth_config.get("token")
         if token:
-            headers["Authorization"] = f"Bearer {token}"
+            set_header(headers, "Authorization", f"Bearer {token}")
     
     elif api.auth_type == "api_key" and api.auth_config:
         key_name = api.auth_config.get("key_name", "X-API-Key")
         key_value = api.auth_config.get("key_value")
         if key_value:
-            headers[key_name] = key_value
+            set_header(headers, key_name, key_value)
     
     elif api.auth_type == "basic" and api.auth_config:
         username = api.auth_config.get("username")
         password = api.auth_config.get("password")
         if username and password:
-            import base64
             credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
-            headers["Authorization"] = f"Basic {credentials}"
+            set_header(headers, "Authorization", f"Basic {credentials}")
     
     return headers
 
-@router.api_route("/{api_id}/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
+async def read_response_body(
+    response: httpx.Response,
+    accepted_encodings: Dict[str, float]
+) -> Tuple[bytes, Optional[str]]:
+    try:
+        upstream_encoding = response.headers.get("content-encoding")
+        if upstream_encoding and compression.accepts(accepted_encodings, upstream_encoding):
+            return b"".join([chunk async for chunk in response.aiter_raw()]), upstream_encoding
+
+        content = await response.aread()
+    finally:
+        await response.aclose()
+
+    if compression.is_partial(response.status_code, response.headers.get("content-range")):
+        return content, None
+    if not compression.should_compress(response.headers.get("content-type"), content):
+        return content, None
+
+    encoding = compression.choose_encoding(accepted_encodings)
+    if encoding is None:
+        return content, None
+
+    if len(content) >= settings.PROXY_COMPRESSION_THREADPOOL_BYTES:
+        return await run_in_threadpool(compression.compress, content, encoding), encoding
+    return compression.compress(content, encoding), encoding
+
+@router.api_route(
+    "/{api_id}/{path:path}",
+    methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
+    dependencies=[Depends(profiled("proxy"))]
+)
 async def proxy_request(
     api_id: int,
     path: str,
     request: Request,
+    # Function scope exits when the handler returns, before BackgroundTasks
+    # (metering, events, periodic jobs) run, so this is what clients see.
+    _latency: None = Depends(observe_proxy_latency, scope="function"),
     api_key: APIKey = Depends(get_api_key_from_header),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    pipeline: PostResponsePipeline = Depends(get_post_response_pipeline)
 ):
     start_time = time.time()
     
-    api_logger.info(f"Proxy request: api_id={api_id}, path={path}, method={request.method}, user_id={api_key.user_id}")
+    proxy_logger.info("Proxy request: api_id=%s, path=%s, method=%s, user_id=%s", api_id, path, request.method, api_key.user_id)
 
-    is_allowed, rate_limit_info = rate_limit_service.check_rate_limit(
-        db=db,
-        api_id=api_id,
-        api_key_id=api_key.id
-    )
+    with metrics.time_phase("rate_limit", api_id):
+        is_allowed, rate_limit_info = await rate_limit_service.check_rate_limit(
+            db=db,
+            api_id=api_id,
+            api_key_id=api_key.id
+        )
+
+    if not is_allowed and rate_limit_info is None:
+        return error_response(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Rate limiting unavailable",
+            headers={"Retry-After": "1"}
+        )
 
-    if not is_allowed and rate_limit_info:
-        api_logger.warning(f"Rate limit exceeded for api_id={api_id}, key_id={api_key.id}")
+    if not is_allowed:
+        api_logger.warning("Rate limit exceeded for api_id=%s, key_id=%s", api_id, api_key.id)
         
-        webhook_service.publish_event(
+        pipeline.add_job(
+            webhook_service.publish_event,
             event_type='api.rate_limit',
             api_id=api_id,
             payload={
@@ -112,83 +194,117 @@ async def proxy_request(
             }
         )
         
-        raise HTTPException(
+        return error_response(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Rate limit exceeded",
             headers={
-                "X-RateLimit-Limit-Hour": str(rate_limit_info["limit_hour"]),
-                "X-RateLimit-Remaining-Hour": str(rate_limit_info["remaining_hour"]),
-                "X-RateLimit-Reset-Hour": str(rate_limit_info["reset_hour"]),
-                "X-RateLimit-Limit-Day": str(rate_limit_info["limit_day"]),
-                "X-RateLimit-Remaining-Day": str(rate_limit_info["remaining_day"]),
-                "X-RateLimit-Reset-Day": str(rate_limit_info["reset_day"]),
+                **rate_limit_header_dict(rate_limit_info),
                 "Retry-After": str(rate_limit_info["reset_hour"] - int(time.time()))
             }
         )
 
+    route_started = time.perf_counter()
     api = db.query(API).filter(
         API.id == api_id,
         API.user_id == api_key.user_id
     ).first()
+    route_lookup_seconds = time.perf_counter() - route_started
     
     if not api:
-        api_logger.warning(f"API not found or access denied: api_id={api_id}, user_id={api_key.user_id}")
+        api_logger.warning("API not found or access denied: api_id=%s, user_id=%s", api_id, api_key.user_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="API not found"
         )
     
     if not api.is_active:
-        api_logger.warning(f"API is inactive: api_id={api_id}")
+        api_logger.warning("API is inactive: api_id=%s", api_id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="API is inactive"
         )
     
-    target_url = f"{api.base_url.rstrip('/')}/{path.lstrip('/')}"
-    
-    headers = dict(request.headers)
-    headers.pop("host", None)
-    headers.pop("x-api-key", None)
+    is_allowed, retry_after, is_probe = await circuit_breaker.allow_request(
+        api_id,
+        probe_ttl=api.connect_timeout + api.read_timeout
+    )
+
+    if not is_allowed:
+        api_logger.warning("Circuit open, failing fast: api_id=%s, retry_after=%ss", api_id, retry_after)
+        pipeline.add_db_job(track_usage, api_id, f"/{path}", request.method, 503, (time.time() - start_time) * 1000)
+        return error_response(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Upstream API unavailable",
+            headers={"Retry-After": str(retry_after)}
+        )
 
-    headers = add_auth_headers(headers, api)
-    
-    body = await request.body()
-    
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                headers=headers,
-                params=request.query_params,
-                content=body
-            )
+        route_started = time.perf_counter()
+        targets = upstream_target_service.get_active_targets(db, api_id)
+        metrics.observe_phase("route_lookup", api_id, route_lookup_seconds + time.perf_counter() - route_started)
+
+        headers = build_upstream_headers(
+            request.headers.raw,
+            request.client.host if request.client else None,
+            request.url.scheme
+        )
+
+        headers = add_auth_headers(headers, api)
+
+        body = await request.body()
+
+        client = http_client_pool.get_client(api)
+        with metrics.time_phase("upstream", api_id):
+            async with http_client_pool.concurrency_slot(api):
+                response = await upstream_service.send(
+                    client=client,
+                    api=api,
+                    targets=targets,
+                    method=request.method,
+                    path=path,
+                    headers=headers,
+                    params=request.query_params,
+                    content=body
+                )
+                content, content_encoding = await read_response_body(
+                    response,
+                    compression.parse_accept_encoding(request.headers.get("accept-encoding"))
+                )
         
         response_time_ms = (time.time() - start_time) * 1000
+        metrics.record_upstream_response(api_id, metrics.status_class(response.status_code))
 
-        track_usage(
-            db=db,
+        if response.status_code >= 500:
+            await circuit_breaker.record_failure(api_id, is_probe=is_probe)
+        else:
+            await circuit_breaker.record_success(api_id, is_probe=is_probe)
+
+        pipeline.add_db_job(
+            track_usage,
             api_id=api_id,
             endpoint=f"/{path}",
             method=request.method,
             status_code=response.status_code,
-            response_time_ms=response_time_ms
+            response_time_ms=response_time_ms,
+            http_version=response.http_version
         )
 
-        webhook_service.publish_event(
+        pipeline.add_job(
+            webhook_service.publish_event,
             event_type='api.request',
             api_id=api_id,
             payload={
                 'endpoint': f"/{path}",
                 'method': request.method,
                 'status_code': response.status_code,
-                'response_time_ms': response_time_ms
+                'response_time_ms': response_time_ms,
+                'http_version': response.http_version
             }
         )
 
         if response.status_code >= 400:
-            webhook_service.publish_event(
+            pipeline.add_job(
+                webhook_service.publish_event,
                 event_type='api.error',
                 api_id=api_id,
                 payload={
@@ -199,46 +315,46 @@ async def proxy_request(
                 }
             )
 
-        excluded_headers = {
-            "content-length",
-            "content-encoding",
-            "transfer-encoding",
-            "connection"
-        }
-        response_headers = {
-            k: v for k, v in response.headers.items()
-            if k.lower() not in excluded_headers
-        }
+        response_headers = filter_response_headers(response.headers.raw)
+
+        if content_encoding:
+            response_headers.append((b"content-encoding", content_encoding.encode("latin-1")))
+        if compression.varies_on_accept_encoding(response.headers.get("content-type"), response.headers.get("content-encoding")):
+            add_vary(response_headers, b"Accept-Encoding")
         
         if rate_limit_info:
-            response_headers["X-RateLimit-Limit-Hour"] = str(rate_limit_info["limit_hour"])
-            response_headers["X-RateLimit-Remaining-Hour"] = str(rate_limit_info["remaining_hour"])
-            response_headers["X-RateLimit-Reset-Hour"] = str(rate_limit_info["reset_hour"])
-            response_headers["X-RateLimit-Limit-Day"] = str(rate_limit_info["limit_day"])
-            response_headers["X-RateLimit-Remaining-Day"] = str(rate_limit_info["remaining_day"])
-            response_headers["X-RateLimit-Reset-Day"] = str(rate_limit_info["reset_day"])
+            response_headers.extend(rate_limit_headers(rate_limit_info))
         
-        return Response(
-            content=response.content,
-            status_code=response.status_code,
-            headers=response_headers,
-            media_type=response.headers.get("content-type")
-        )
+        proxied_response = Response(content=content, status_code=response.status_code)
+        proxied_response.raw_headers.extend(response_headers)
+        return proxied_response
         
     except httpx.TimeoutException:
         response_time_ms = (time.time() - start_time) * 1000
-        track_usage(db, api_id, f"/{path}", request.method, 504, response_time_ms)
-        api_logger.error(f"Timeout proxying to {target_url}")
-        raise HTTPException(
+        metrics.record_upstream_response(api_id, "timeout")
+        await circuit_breaker.record_failure(api_id, is_timeout=True, is_probe=is_probe)
+        pipeline.add_db_job(track_usage, api_id, f"/{path}", request.method, 504, response_time_ms)
+        api_logger.error("Timeout proxying to api_id=%s, path=/%s", api_id, path)
+        return error_response(
             status_code=status.HTTP_504_GATEWAY_TIMEOUT,
             detail="Upstream API timeout"
         )
     
     except httpx.RequestError as e:
         response_time_ms = (time.time() - start_time) * 1000
-        track_usage(db, api_id, f"/{path}", request.method, 502, response_time_ms)
-        api_logger.error(f"Error proxying to {target_url}: {str(e)}")
-        raise HTTPException(
+        metrics.record_upstream_response(api_id, "error")
+        await circuit_breaker.record_failure(api_id, is_probe=is_probe)
+        pipeline.add_db_job(track_usage, api_id, f"/{path}", request.method, 502, response_time_ms)
+        api_logger.error("Error proxying to api_id=%s, path=/%s: %s", api_id, path, e)
+        return error_response(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Failed to connect to upstream API"
         )
+
+    except BaseException:
+        # Client disconnects, cancellation and unexpected errors record no
+        # result, so give the half-open probe slot back instead of holding it
+        # until its TTL.
+        if is_probe:
+            await circuit_breaker.release_probe(api_id)
+        raise
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.upstream_target import UpstreamTarget
+from app.models.user import User
+from app.schemas.upstream_target import (
+    UpstreamTargetCreateRequest,
+    UpstreamTargetUpdateRequest,
+    UpstreamTargetResponse,
+    UpstreamTargetListResponse
+)
+from app.services import upstream_target_service
+from app.services.load_balancer_service import load_balancer
+from app.utils.dependencies import get_current_user, get_read_db
+from app.utils.logger import api_logger
+
+router = APIRouter(prefix="/apis", tags=["Upstream Targets"])
+
+def to_response(target: UpstreamTarget) -> UpstreamTargetResponse:
+    response = UpstreamTargetResponse.model_validate(target)
+    response.is_healthy = load_balancer.is_healthy(target.id)
+    return response
+
+@router.post("/{api_id}/targets", response_model=UpstreamTargetResponse, status_code=status.HTTP_201_CREATED)
+def create_target(
+    api_id: int,
+    target_data: UpstreamTargetCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    api_logger.info(f"Create upstream target for api_id={api_id}, user_id={current_user.id}")
+
+    try:
+        target = upstream_target_service.create_target(
+            db=db,
+            api_id=api_id,
+            user=current_user,
+            url=str(target_data.url),
+            weight=target_data.weight,
+            is_active=target_data.is_active
+        )
+        return to_response(target)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+@router.get("/{api_id}/targets", response_model=UpstreamTargetListResponse)
+def list_targets(
+    api_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    api_logger.info(f"List upstream targets for api_id={api_id}, user_id={current_user.id}")
+
+    targets = upstream_target_service.get_targets(db=db, api_id=api_id, user=current_user)
+    return UpstreamTargetListResponse(
+        total=len(targets),
+        targets=[to_response(target) for target in targets]
+    )
+
+@router.put("/{api_id}/targets/{target_id}", response_model=UpstreamTargetResponse)
+def update_target(
+    api_id: int,
+    target_id: int,
+    target_data: UpstreamTargetUpdateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    api_logger.info(f"Update upstream target: id={target_id}, api_id={api_id}, user_id={current_user.id}")
+
+    target = upstream_target_service.update_target(
+        db=db,
+        api_id=api_id,
+        target_id=target_id,
+        user=current_user,
+        url=str(target_data.url) if target_data.url else None,
+        weight=target_data.weight,
+        is_active=target_data.is_active
+    )
+
+    if not target:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upstream target not found"
+        )
+
+    return to_response(target)
+
+@router.delete("/{api_id}/targets/{target_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_target(
+    api_id: int,
+    target_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    api_logger.info(f"Delete upstream target: id={target_id}, api_id={api_id}, user_id={current_user.id}")
+
+    success = upstream_target_service.delete_target(
+        db=db,
+        api_id=api_id,
+        target_id=target_id,
+        user=current_user
+    )
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upstream target not found"
+        )
+
+    return None
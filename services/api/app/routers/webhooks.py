@@ -10,7 +10,7 @@ from app.schemas.webhook import (
     WebhookDeliveryResponse
 )
 from app.services import webhook_service
-from app.utils.dependencies import get_current_user
+from app.utils.dependencies import get_current_user, get_read_db
 from app.utils.logger import api_logger
 
 router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
@@ -44,7 +44,7 @@ def create_subscription(
 def list_subscriptions(
     api_id: int = Query(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     api_logger.info(f"List webhook subscriptions for api_id={api_id}, user_id={current_user.id}")
     
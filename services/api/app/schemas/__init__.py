@@ -4,3 +4,5 @@ from . import auth
 from . import rate_limit
 from . import analytics
 from . import webhook
+from . import upstream_target
+from . import profiling
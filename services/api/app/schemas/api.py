@@ -10,12 +10,29 @@ class AuthType(str, Enum):
     BASIC = "basic"
     CUSTOM = "custom"
 
+class LoadBalancingStrategy(str, Enum):
+    ROUND_ROBIN = "round_robin"
+    LEAST_OUTSTANDING = "least_outstanding"
+    LATENCY_EWMA = "latency_ewma"
+
 class APICreateRequest(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
     base_url: HttpUrl
     auth_type: AuthType = AuthType.NONE
     auth_config: Optional[dict] = None
+    connect_timeout: float = Field(5.0, gt=0, le=30, description="Upstream connect timeout in seconds")
+    read_timeout: float = Field(30.0, gt=0, le=30, description="Upstream read timeout in seconds")
+    write_timeout: float = Field(30.0, gt=0, le=30, description="Upstream write timeout in seconds")
+    pool_timeout: float = Field(5.0, gt=0, le=30, description="Timeout waiting for a pooled connection in seconds")
+    max_retries: int = Field(0, ge=0, le=5, description="Retries for connection errors and idempotent requests")
+    retry_backoff_ms: int = Field(100, ge=0, le=5000, description="Base delay for exponential retry backoff")
+    hedging_enabled: bool = Field(False, description="Send a duplicate idempotent request when the first is slow")
+    hedge_delay_ms: Optional[int] = Field(None, gt=0, le=30000, description="Fixed hedge delay; defaults to the API's p95 latency")
+    load_balancing_strategy: LoadBalancingStrategy = Field(LoadBalancingStrategy.ROUND_ROBIN, description="How requests are spread across upstream targets")
+    http2_enabled: bool = Field(False, description="Negotiate HTTP/2 with the upstream and multiplex requests")
+    max_connections: int = Field(20, ge=1, le=1000, description="Upstream connection pool size")
+    max_concurrent_requests: Optional[int] = Field(None, ge=1, le=10000, description="Cap on in-flight upstream requests per worker")
 
 class APIUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
@@ -24,6 +41,18 @@ class APIUpdateRequest(BaseModel):
     auth_type: Optional[AuthType] = None
     auth_config: Optional[dict] = None
     is_active: Optional[bool] = None
+    connect_timeout: Optional[float] = Field(None, gt=0, le=30)
+    read_timeout: Optional[float] = Field(None, gt=0, le=30)
+    write_timeout: Optional[float] = Field(None, gt=0, le=30)
+    pool_timeout: Optional[float] = Field(None, gt=0, le=30)
+    max_retries: Optional[int] = Field(None, ge=0, le=5)
+    retry_backoff_ms: Optional[int] = Field(None, ge=0, le=5000)
+    hedging_enabled: Optional[bool] = None
+    hedge_delay_ms: Optional[int] = Field(None, gt=0, le=30000)
+    load_balancing_strategy: Optional[LoadBalancingStrategy] = None
+    http2_enabled: Optional[bool] = None
+    max_connections: Optional[int] = Field(None, ge=1, le=1000)
+    max_concurrent_requests: Optional[int] = Field(None, ge=1, le=10000)
 
 class APIResponse(BaseModel):
     id: int
@@ -32,6 +61,18 @@ class APIResponse(BaseModel):
     base_url: str
     auth_type: str
     is_active: bool
+    connect_timeout: float
+    read_timeout: float
+    write_timeout: float
+    pool_timeout: float
+    max_retries: int
+    retry_backoff_ms: int
+    hedging_enabled: bool
+    hedge_delay_ms: Optional[int]
+    load_balancing_strategy: str
+    http2_enabled: bool
+    max_connections: int
+    max_concurrent_requests: Optional[int]
     user_id: int
     created_at: datetime
     updated_at: datetime
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class ProfilingSessionRequest(BaseModel):
+    sample_rate: float = Field(..., gt=0, le=1)
+    duration_seconds: int = Field(default=300, gt=0)
+
+class ProfilingSessionResponse(BaseModel):
+    sample_rate: float
+    expires_at: datetime
+
+class ProfilingStatusResponse(BaseModel):
+    enabled: bool
+    default_sample_rate: float
+    sink: str
+    session: Optional[ProfilingSessionResponse] = None
+    active_requests: int
+    samples: int
+    distinct_stacks: int
+    window_started_at: datetime
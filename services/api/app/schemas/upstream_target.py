@@ -0,0 +1,30 @@
+from pydantic import BaseModel, HttpUrl, Field
+from datetime import datetime
+from typing import Optional, List
+
+class UpstreamTargetCreateRequest(BaseModel):
+    url: HttpUrl
+    weight: int = Field(1, ge=1, le=100, description="Relative share of traffic sent to this target")
+    is_active: bool = True
+
+class UpstreamTargetUpdateRequest(BaseModel):
+    url: Optional[HttpUrl] = None
+    weight: Optional[int] = Field(None, ge=1, le=100)
+    is_active: Optional[bool] = None
+
+class UpstreamTargetResponse(BaseModel):
+    id: int
+    api_id: int
+    url: str
+    weight: int
+    is_active: bool
+    is_healthy: bool = True
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class UpstreamTargetListResponse(BaseModel):
+    total: int
+    targets: List[UpstreamTargetResponse]
@@ -0,0 +1,47 @@
+import os
+import shutil
+import tempfile
+import uvicorn
+from app.config import get_settings
+
+settings = get_settings()
+
+# Entry point for running the API as a long-running server (containers, VMs)
+# instead of behind Mangum on Lambda: `python -m app.server`.
+
+def prepare_metrics_dir():
+    # Each worker is a separate process with its own registry. prometheus_client
+    # multiprocess mode shares values through files in this directory; it must
+    # be set before workers import prometheus_client and be empty on start.
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        directory = os.path.join(tempfile.gettempdir(), "apiverse-metrics")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+def main():
+    if settings.SERVER_WORKERS > 1 and settings.METRICS_ENABLED:
+        prepare_metrics_dir()
+
+    # loop/http "auto" pick uvloop and httptools when installed.
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=settings.SERVER_WORKERS,
+        loop="auto",
+        http="auto",
+        lifespan="on",
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+        # Proxied requests are already recorded in usage_metrics.
+        access_log=False
+    )
+
+if __name__ == "__main__":
+    main()
@@ -5,3 +5,11 @@ from . import rate_limit_service
 from . import redis_service
 from . import analytics_service
 from . import webhook_service
+
+from . import circuit_breaker_service
+from . import upstream_service
+from . import load_balancer_service
+from . import upstream_target_service
+from . import http_client_service
+from . import post_response_service
+from . import read_replica_service
\ No newline at end of file
@@ -1,20 +1,33 @@
 import secrets
-from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, List, Tuple
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from app.config import get_settings
 from app.models.api_key import APIKey
 from app.models.user import User
-from app.utils.logger import api_logger
+from app.services.redis_service import redis_service
+from app.utils import metrics
+from app.utils.hashing import HashingOverloadedError
+from app.utils.logger import api_logger, proxy_logger
+from app.utils.security import hash_api_key, verify_api_key_and_rehash
 
-ph = PasswordHasher()
+settings = get_settings()
+
+LAST_USED_KEY = "api_keys:last_used"
+LAST_USED_FLUSH_LOCK_KEY = "api_keys:last_used:flush_lock"
+
+_recorded_minutes: Dict[int, int] = {}
+_pending_last_used: Dict[int, int] = {}
+_last_flush_attempt = 0.0
 
 def generate_api_key(environment: str) -> Tuple[str, str, str]:
     random_part = secrets.token_urlsafe(32)
     full_key = f"apv_{environment}_{random_part}"
 
-    key_hash = ph.hash(full_key)
+    key_hash = hash_api_key(full_key)
     key_prefix = full_key[:12] + "...."
 
     api_logger.info(f"Generated API Key with prefix: {key_prefix}")
@@ -62,7 +75,7 @@ def get_user_api_keys(db: Session, user: User) -> List[APIKey]:
     api_logger.info(f"Found {len(api_keys)} API keys for user: {user.id}")
     return api_keys
 
-def verify_api_key(db: Session, api_key: str) -> Optional[APIKey]:
+async def verify_api_key(db: Session, api_key: str) -> Optional[APIKey]:
     try:
         key_prefix = api_key[:12] + "...."
 
@@ -71,33 +84,135 @@ def verify_api_key(db: Session, api_key: str) -> Optional[APIKey]:
         ).first()
 
         if not api_key_record:
-            api_logger.warning(f"API Key with prefix: {key_prefix} not found")
+            api_logger.warning("API Key with prefix: %s not found", key_prefix)
             return None
 
         if not api_key_record.is_active:
-            api_logger.warning(f"API key with id: {api_key_record.id} is inactive")
+            api_logger.warning("API key with id: %s is inactive", api_key_record.id)
             return None
 
         if api_key_record.expires_at and api_key_record.expires_at < datetime.utcnow():
-            api_logger.warning(f"API Key with id: {api_key_record.id} has expired")
+            api_logger.warning("API Key with id: %s has expired", api_key_record.id)
             return None
 
-        try:
-            ph.verify(api_key_record.key_hash, api_key)
-        except VerifyMismatchError:
-            api_logger.warning(f"API Key hash mismatch for id: {api_key_record.id}")
+        verified, new_hash = await verify_api_key_and_rehash(api_key, api_key_record.key_hash)
+        if not verified:
+            api_logger.warning("API Key hash mismatch for id: %s", api_key_record.id)
             return None
 
-        api_key_record.last_used_at = datetime.utcnow()
-        db.commit()
+        if new_hash is not None:
+            api_key_record.key_hash = new_hash
+            db.commit()
+            api_logger.info("Rehashed API key with current Argon2 parameters: id: %s", api_key_record.id)
 
-        api_logger.info(f"API key verified: id: {api_key_record.id}, user: {api_key_record.user_id}")
+        proxy_logger.info("API key verified: id: %s, user: %s", api_key_record.id, api_key_record.user_id)
         return api_key_record
-    
+
+    except HashingOverloadedError:
+        raise
     except Exception as e:
-        api_logger.error(f"Error verifying API key with error {str(e)}")
+        metrics.record_backend_error("db", "verify_api_key")
+        api_logger.error("Error verifying API key with error %s", e)
         return None
 
+def record_last_used(api_key_id: int):
+    minute = int(time.time()) // 60
+    if _recorded_minutes.get(api_key_id) == minute:
+        return
+
+    _recorded_minutes[api_key_id] = minute
+    try:
+        redis_service.get_client().hset(LAST_USED_KEY, api_key_id, minute * 60)
+    except Exception as e:
+        metrics.record_backend_error("redis", "record_last_used")
+        api_logger.error("Redis error recording API key last use: %s", e)
+        _pending_last_used[api_key_id] = minute * 60
+
+def _take_recorded_last_used() -> Dict[int, int]:
+    last_used = dict(_pending_last_used)
+    _pending_last_used.clear()
+
+    try:
+        redis_client = redis_service.get_client()
+        flushing_key = f"{LAST_USED_KEY}:flushing:{uuid.uuid4().hex}"
+        if redis_client.exists(LAST_USED_KEY):
+            redis_client.rename(LAST_USED_KEY, flushing_key)
+            pipe = redis_client.pipeline()
+            pipe.hgetall(flushing_key)
+            pipe.delete(flushing_key)
+            recorded, _ = pipe.execute()
+            for api_key_id, timestamp in recorded.items():
+                api_key_id = int(api_key_id)
+                last_used[api_key_id] = max(int(timestamp), last_used.get(api_key_id, 0))
+    except Exception as e:
+        api_logger.error(f"Redis error reading API key last use: {str(e)}")
+
+    return last_used
+
+def flush_last_used(db: Session) -> int:
+    last_used = _take_recorded_last_used()
+    if not last_used:
+        return 0
+
+    rows = [
+        (api_key_id, datetime.fromtimestamp(timestamp, tz=timezone.utc))
+        for api_key_id, timestamp in last_used.items()
+    ]
+
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            params = {}
+            values = []
+            for index, (api_key_id, used_at) in enumerate(rows):
+                values.append(f"(CAST(:id_{index} AS INTEGER), CAST(:used_at_{index} AS TIMESTAMPTZ))")
+                params[f"id_{index}"] = api_key_id
+                params[f"used_at_{index}"] = used_at
+
+            db.execute(text(
+                "UPDATE api_keys SET last_used_at = v.used_at "
+                f"FROM (VALUES {', '.join(values)}) AS v(id, used_at) "
+                "WHERE api_keys.id = v.id "
+                "AND (api_keys.last_used_at IS NULL OR api_keys.last_used_at < v.used_at)"
+            ), params)
+        else:
+            for api_key_id, used_at in rows:
+                db.query(APIKey).filter(APIKey.id == api_key_id).update(
+                    {APIKey.last_used_at: used_at},
+                    synchronize_session=False
+                )
+        db.commit()
+    except Exception:
+        db.rollback()
+        for api_key_id, timestamp in last_used.items():
+            _pending_last_used[api_key_id] = max(timestamp, _pending_last_used.get(api_key_id, 0))
+        raise
+
+    api_logger.info(f"Flushed last_used_at for {len(rows)} API keys")
+    return len(rows)
+
+def flush_last_used_if_due(db: Session) -> int:
+    global _last_flush_attempt
+
+    now = time.time()
+    if now - _last_flush_attempt < settings.API_KEY_LAST_USED_FLUSH_SECONDS:
+        return 0
+    _last_flush_attempt = now
+
+    try:
+        acquired = redis_service.get_client().set(
+            LAST_USED_FLUSH_LOCK_KEY,
+            1,
+            nx=True,
+            ex=settings.API_KEY_LAST_USED_FLUSH_SECONDS
+        )
+    except Exception as e:
+        api_logger.error(f"Redis error acquiring last_used flush lock: {str(e)}")
+        acquired = bool(_pending_last_used)
+
+    if not acquired:
+        return 0
+    return flush_last_used(db)
+
 def revoke_api_key(db: Session, api_key_id: int, user: User) -> bool:
     api_logger.info(f"Revoking API Key: id={api_key_id}, user_id={user.id}")
 
@@ -4,6 +4,21 @@ from app.models.api import API
 from app.models.user import User
 from app.utils.logger import api_logger
 
+UPSTREAM_SETTINGS = (
+    "connect_timeout",
+    "read_timeout",
+    "write_timeout",
+    "pool_timeout",
+    "max_retries",
+    "retry_backoff_ms",
+    "hedging_enabled",
+    "hedge_delay_ms",
+    "load_balancing_strategy",
+    "http2_enabled",
+    "max_connections",
+    "max_concurrent_requests",
+)
+
 def create_api(
     db: Session,
     user: User,
@@ -11,7 +26,8 @@ def create_api(
     base_url: str,
     auth_type: str,
     description: Optional[str] = None,
-    auth_config: Optional[dict] = None
+    auth_config: Optional[dict] = None,
+    upstream_settings: Optional[dict] = None
 ) -> API:
     api_logger.info(f"Creating API: name={name}, user_id={user.id}, base_url={base_url}")
     
@@ -25,6 +41,10 @@ def create_api(
         is_active=True
     )
 
+    for field, value in (upstream_settings or {}).items():
+        if field in UPSTREAM_SETTINGS:
+            setattr(api, field, value)
+
     db.add(api)
     db.commit()
     db.refresh(api)
@@ -61,7 +81,8 @@ def update_api(
     base_url: Optional[str] = None,
     auth_type: Optional[str] = None,
     auth_config: Optional[dict] = None,
-    is_active: Optional[bool] = True
+    is_active: Optional[bool] = True,
+    upstream_settings: Optional[dict] = None
 ) -> API:
     api_logger.info(f"Updating API: api_id={api.id}, name={api.name}")
     
@@ -78,6 +99,13 @@ def update_api(
     if is_active is not None:
         api.is_active = is_active
 
+    for field, value in (upstream_settings or {}).items():
+        if field not in UPSTREAM_SETTINGS:
+            continue
+        if value is None and not API.__table__.c[field].nullable:
+            continue
+        setattr(api, field, value)
+
     db.commit()
     db.refresh(api)
     
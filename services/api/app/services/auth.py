@@ -1,7 +1,7 @@
 from typing import Optional
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.utils.security import hash_password, verify_password
+from app.utils.security import hash_password, verify_password_and_rehash
 from app.utils.logger import auth_logger
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
@@ -13,9 +13,15 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         auth_logger.warning(f"Authentication failed: User not found - {email}")
         return None
     
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = verify_password_and_rehash(password, user.hashed_password)
+    if not verified:
         auth_logger.warning(f"Authentication failed: Invalid password - {email}")
         return None
+
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        db.commit()
+        auth_logger.info(f"Rehashed password with current Argon2 parameters for user_id: {user.id}")
     
     auth_logger.info(f"Authentication successful for user_id: {user.id}, email: {email}")
     return user
@@ -0,0 +1,205 @@
+import math
+import time
+from typing import Dict, Optional, Tuple
+from app.config import get_settings
+from app.services.redis_service import redis_service
+from app.utils import metrics
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+BUCKET_COUNT = 6
+
+class CircuitBreaker:
+    def __init__(self):
+        self._open_until: Dict[int, float] = {}
+        self._closed_checked_at: Dict[int, float] = {}
+        self._probe_open_until: Dict[int, float] = {}
+
+    def _bucket_seconds(self) -> int:
+        return max(1, settings.CIRCUIT_BREAKER_WINDOW_SECONDS // BUCKET_COUNT)
+
+    def _open_key(self, api_id: int) -> str:
+        return f"circuit:api:{api_id}:open_until"
+
+    def _probe_key(self, api_id: int, open_until: float) -> str:
+        return f"circuit:api:{api_id}:probes:{int(open_until)}"
+
+    def _stats_key(self, api_id: int, bucket: int) -> str:
+        return f"circuit:api:{api_id}:stats:{bucket}"
+
+    # probe_ttl bounds how long an admitted probe holds its half-open slot,
+    # normally the upstream timeout, in case no result is ever recorded.
+    async def allow_request(self, api_id: int, probe_ttl: Optional[float] = None) -> Tuple[bool, int, bool]:
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return True, 0, False
+
+        now = time.time()
+
+        open_until = self._open_until.get(api_id)
+        if open_until and now < open_until:
+            return False, max(1, int(open_until - now)), False
+
+        checked_at = self._closed_checked_at.get(api_id)
+        if checked_at and now - checked_at < settings.CIRCUIT_BREAKER_LOCAL_CACHE_SECONDS:
+            return True, 0, False
+
+        try:
+            redis_client = redis_service.get_async_client()
+            stored = await redis_client.get(self._open_key(api_id))
+
+            if not stored:
+                self._open_until.pop(api_id, None)
+                self._closed_checked_at[api_id] = now
+                return True, 0, False
+
+            open_until = float(stored)
+            if now < open_until:
+                self._open_until[api_id] = open_until
+                self._closed_checked_at.pop(api_id, None)
+                return False, max(1, int(open_until - now)), False
+
+            probe_key = self._probe_key(api_id, open_until)
+            pipe = redis_client.pipeline()
+            pipe.incr(probe_key)
+            pipe.expire(probe_key, max(1, math.ceil(probe_ttl or settings.CIRCUIT_BREAKER_OPEN_SECONDS)))
+            probes, _ = await pipe.execute()
+
+            if int(probes) <= settings.CIRCUIT_BREAKER_HALF_OPEN_PROBES:
+                self._probe_open_until[api_id] = open_until
+                api_logger.info("Circuit half-open, admitting probe: api_id=%s, probe=%s", api_id, probes)
+                return True, 0, True
+
+            # Only admitted probes hold a slot, so release_probe can free one.
+            await redis_client.decr(probe_key)
+            return False, 1, False
+
+        except Exception as e:
+            metrics.record_backend_error("redis", "circuit_breaker")
+            api_logger.error("Redis error in circuit breaker: %s", e)
+            return True, 0, False
+
+    # Frees the slot of a probe that ended without a recorded result.
+    async def release_probe(self, api_id: int):
+        open_until = self._probe_open_until.get(api_id)
+        if open_until is None:
+            return
+
+        probe_key = self._probe_key(api_id, open_until)
+        try:
+            # Re-applying the TTL keeps a key that expired meanwhile from
+            # being left behind as a counter without one.
+            pipe = redis_service.get_async_client().pipeline()
+            pipe.decr(probe_key)
+            pipe.expire(probe_key, settings.CIRCUIT_BREAKER_OPEN_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            metrics.record_backend_error("redis", "circuit_breaker")
+            api_logger.error("Redis error in circuit breaker: %s", e)
+
+    async def record_success(self, api_id: int, is_probe: bool = False):
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return
+
+        try:
+            redis_client = redis_service.get_async_client()
+
+            if is_probe:
+                await self._close(redis_client, api_id)
+                return
+
+            stats_key = self._stats_key(api_id, int(time.time()) // self._bucket_seconds())
+            pipe = redis_client.pipeline()
+            pipe.hincrby(stats_key, "total", 1)
+            pipe.expire(stats_key, settings.CIRCUIT_BREAKER_WINDOW_SECONDS + self._bucket_seconds())
+            await pipe.execute()
+
+        except Exception as e:
+            metrics.record_backend_error("redis", "circuit_breaker")
+            api_logger.error("Redis error in circuit breaker: %s", e)
+
+    async def record_failure(self, api_id: int, is_timeout: bool = False, is_probe: bool = False):
+        if not settings.CIRCUIT_BREAKER_ENABLED:
+            return
+
+        try:
+            redis_client = redis_service.get_async_client()
+
+            if is_probe:
+                await self._open(redis_client, api_id, reason="probe failed")
+                return
+
+            # Requests already in flight when the circuit opened keep failing
+            # for up to the read timeout; they must not push open_until later.
+            open_until = self._open_until.get(api_id)
+            if open_until and time.time() < open_until:
+                return
+
+            now = int(time.time())
+            bucket_seconds = self._bucket_seconds()
+            current_bucket = now // bucket_seconds
+            stats_key = self._stats_key(api_id, current_bucket)
+
+            pipe = redis_client.pipeline()
+            pipe.hincrby(stats_key, "total", 1)
+            pipe.hincrby(stats_key, "errors", 1)
+            if is_timeout:
+                pipe.hincrby(stats_key, "timeouts", 1)
+            pipe.expire(stats_key, settings.CIRCUIT_BREAKER_WINDOW_SECONDS + bucket_seconds)
+            for bucket in range(current_bucket - BUCKET_COUNT + 1, current_bucket + 1):
+                pipe.hgetall(self._stats_key(api_id, bucket))
+            results = await pipe.execute()
+
+            total = errors = timeouts = 0
+            for stats in results[-BUCKET_COUNT:]:
+                total += int(stats.get("total", 0))
+                errors += int(stats.get("errors", 0))
+                timeouts += int(stats.get("timeouts", 0))
+
+            if total < settings.CIRCUIT_BREAKER_MIN_REQUESTS:
+                return
+
+            error_rate = errors / total
+            timeout_rate = timeouts / total
+
+            if error_rate >= settings.CIRCUIT_BREAKER_ERROR_RATE:
+                await self._open(redis_client, api_id, reason=f"error_rate={error_rate:.2f}, requests={total}", replace=False)
+            elif timeout_rate >= settings.CIRCUIT_BREAKER_TIMEOUT_RATE:
+                await self._open(redis_client, api_id, reason=f"timeout_rate={timeout_rate:.2f}, requests={total}", replace=False)
+
+        except Exception as e:
+            metrics.record_backend_error("redis", "circuit_breaker")
+            api_logger.error("Redis error in circuit breaker: %s", e)
+
+    # replace=False only opens a closed circuit, so another worker's late
+    # failures cannot extend one that is already open or half-open.
+    async def _open(self, redis_client, api_id: int, reason: str, replace: bool = True):
+        open_until = time.time() + settings.CIRCUIT_BREAKER_OPEN_SECONDS
+
+        opened = await redis_client.set(
+            self._open_key(api_id),
+            open_until,
+            ex=settings.CIRCUIT_BREAKER_OPEN_SECONDS + settings.CIRCUIT_BREAKER_WINDOW_SECONDS,
+            nx=not replace
+        )
+        if not opened:
+            return
+
+        self._open_until[api_id] = open_until
+        self._closed_checked_at.pop(api_id, None)
+
+        api_logger.warning("Circuit opened: api_id=%s, %s", api_id, reason)
+
+    async def _close(self, redis_client, api_id: int):
+        current_bucket = int(time.time()) // self._bucket_seconds()
+        stats_keys = [
+            self._stats_key(api_id, bucket)
+            for bucket in range(current_bucket - BUCKET_COUNT + 1, current_bucket + 1)
+        ]
+        await redis_client.delete(self._open_key(api_id), *stats_keys)
+        self._open_until.pop(api_id, None)
+        self._closed_checked_at[api_id] = time.time()
+
+        api_logger.info("Circuit closed: api_id=%s", api_id)
+
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,255 @@
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+from app.config import get_settings
+from app.services.redis_service import redis_service
+from app.utils import metrics
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+# (message id, JSON body, delivery attempt), as consumed by
+# webhook_consumer_service.deliver_messages, which returns the ids to retry.
+Message = Tuple[str, str, int]
+DeliverFn = Callable[[List[Message]], Awaitable[Set[str]]]
+
+_eventbridge_client = None
+
+def get_eventbridge_client():
+    global _eventbridge_client
+    if _eventbridge_client is None:
+        import boto3
+
+        _eventbridge_client = boto3.client('events')
+    return _eventbridge_client
+
+# Events go to EventBridge, whose rule feeds the SQS queue consumed by the
+# Lambda handler; there is no in-process worker.
+class EventBridgeEventBus:
+    has_worker = False
+
+    def publish(self, event: dict) -> Optional[str]:
+        response = get_eventbridge_client().put_events(
+            Entries=[
+                {
+                    'Source': settings.EVENTBRIDGE_SOURCE,
+                    'DetailType': event['event_type'],
+                    'Detail': json.dumps(event),
+                    'EventBusName': settings.EVENTBRIDGE_BUS_NAME
+                }
+            ]
+        )
+        entry = response['Entries'][0]
+        if response.get('FailedEntryCount'):
+            raise RuntimeError(f"EventBridge rejected event: {entry.get('ErrorCode')} {entry.get('ErrorMessage')}")
+        return entry.get('EventId')
+
+    async def run_worker(self, deliver: DeliverFn):
+        return
+
+# Events are appended to a Redis stream and consumed by a consumer group, so
+# any number of workers (servers or `python -m app.worker`) share the load.
+# Unacknowledged entries stay pending; once idle for EVENT_RETRY_DELAY_SECONDS
+# they are reclaimed with XAUTOCLAIM, which also picks up entries from
+# workers that died mid-batch. After EVENT_MAX_DELIVERIES they are moved to
+# the "<stream>:dead" stream.
+class RedisStreamEventBus:
+    has_worker = True
+
+    def __init__(self):
+        self._claim_cursor = "0-0"
+        self._next_claim = 0.0
+
+    def publish(self, event: dict) -> Optional[str]:
+        return redis_service.get_client().xadd(
+            settings.EVENT_STREAM_KEY,
+            {"event": json.dumps(event)},
+            maxlen=settings.EVENT_STREAM_MAXLEN,
+            approximate=True
+        )
+
+    async def _ensure_group(self, client):
+        try:
+            await client.xgroup_create(settings.EVENT_STREAM_KEY, settings.EVENT_STREAM_GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    # Returns the entries and whether they were reclaimed (i.e. redelivered).
+    async def _read(self, client, consumer: str) -> Tuple[List[tuple], bool]:
+        if time.monotonic() >= self._next_claim:
+            self._next_claim = time.monotonic() + settings.EVENT_RETRY_DELAY_SECONDS / 2
+            self._claim_cursor, claimed, *_ = await client.xautoclaim(
+                settings.EVENT_STREAM_KEY,
+                settings.EVENT_STREAM_GROUP,
+                consumer,
+                min_idle_time=int(settings.EVENT_RETRY_DELAY_SECONDS * 1000),
+                start_id=self._claim_cursor,
+                count=settings.EVENT_BATCH_SIZE
+            )
+            if self._claim_cursor != "0-0":
+                self._next_claim = 0.0
+            if claimed:
+                return claimed, True
+
+        response = await client.xreadgroup(
+            settings.EVENT_STREAM_GROUP,
+            consumer,
+            {settings.EVENT_STREAM_KEY: ">"},
+            count=settings.EVENT_BATCH_SIZE,
+            block=settings.EVENT_STREAM_BLOCK_MS
+        )
+        return (response[0][1] if response else []), False
+
+    # One exact-ID lookup per entry: a min..max range over the claimed IDs
+    # would also match other consumers' pending entries in between.
+    async def _delivery_counts(self, client, entry_ids: List[str]) -> Dict[str, int]:
+        pipe = client.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            pipe.xpending_range(
+                settings.EVENT_STREAM_KEY,
+                settings.EVENT_STREAM_GROUP,
+                min=entry_id,
+                max=entry_id,
+                count=1
+            )
+
+        return {
+            entry["message_id"]: entry["times_delivered"]
+            for pending in await pipe.execute()
+            for entry in pending
+        }
+
+    async def _process(self, client, entries: List[tuple], reclaimed: bool, deliver: DeliverFn):
+        counts = await self._delivery_counts(client, [entry_id for entry_id, _ in entries]) if reclaimed else {}
+
+        messages: List[Message] = []
+        done: List[str] = []
+        for entry_id, fields in entries:
+            # Trimmed by MAXLEN while pending (returned as nil by Redis 6.2).
+            if not fields:
+                done.append(entry_id)
+                continue
+
+            attempt = counts.get(entry_id, 1)
+            if attempt > settings.EVENT_MAX_DELIVERIES:
+                await client.xadd(
+                    f"{settings.EVENT_STREAM_KEY}:dead",
+                    {**fields, "entry_id": entry_id, "deliveries": attempt - 1},
+                    maxlen=settings.EVENT_STREAM_MAXLEN,
+                    approximate=True
+                )
+                api_logger.warning(f"Webhook event {entry_id} dead-lettered after {attempt - 1} deliveries")
+                done.append(entry_id)
+                continue
+
+            messages.append((entry_id, fields.get("event", ""), attempt))
+
+        if messages:
+            failed = await deliver(messages)
+            done.extend(message_id for message_id, _, _ in messages if message_id not in failed)
+
+        if done:
+            await client.xack(settings.EVENT_STREAM_KEY, settings.EVENT_STREAM_GROUP, *done)
+
+    async def run_worker(self, deliver: DeliverFn):
+        consumer = f"{socket.gethostname()}-{os.getpid()}"
+        client = redis_service.create_async_client(
+            settings.EVENT_STREAM_BLOCK_MS / 1000 + settings.REDIS_SOCKET_TIMEOUT_SECONDS
+        )
+        group_ready = False
+        api_logger.info(f"Webhook event worker {consumer} reading {settings.EVENT_STREAM_KEY}")
+
+        try:
+            while True:
+                try:
+                    if not group_ready:
+                        await self._ensure_group(client)
+                        group_ready = True
+
+                    entries, reclaimed = await self._read(client, consumer)
+                    if entries:
+                        await self._process(client, entries, reclaimed, deliver)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Re-create the group too, in case the stream was deleted.
+                    group_ready = False
+                    metrics.record_backend_error("redis", "event_stream")
+                    api_logger.error(f"Webhook event worker error: {str(e)}")
+                    await asyncio.sleep(1)
+        finally:
+            await client.aclose()
+
+# Delivers on the event loop of the process that published, for tests and
+# single-node deployments. Pending events are lost if the process exits.
+class InProcessEventBus:
+    has_worker = True
+
+    def __init__(self):
+        self._pending: Deque[Message] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def publish(self, event: dict) -> Optional[str]:
+        if len(self._pending) >= settings.EVENT_QUEUE_MAX_SIZE:
+            raise RuntimeError(f"In-process event queue is full ({len(self._pending)} events)")
+
+        message_id = str(uuid.uuid4())
+        self._enqueue((message_id, json.dumps(event), 1))
+        return message_id
+
+    # publish_event runs on threadpool threads as well as on the loop.
+    def _enqueue(self, message: Message):
+        self._pending.append(message)
+
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            pass
+
+    async def run_worker(self, deliver: DeliverFn):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+        try:
+            while True:
+                self._wakeup.clear()
+                if not self._pending:
+                    await self._wakeup.wait()
+                    continue
+
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), settings.EVENT_BATCH_SIZE))]
+                try:
+                    failed = await deliver(batch)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    api_logger.error(f"Webhook event worker error: {str(e)}")
+                    failed = {message_id for message_id, _, _ in batch}
+
+                for message_id, body, attempt in batch:
+                    if message_id not in failed:
+                        continue
+                    if attempt >= settings.EVENT_MAX_DELIVERIES:
+                        api_logger.warning(f"Webhook event {message_id} dropped after {attempt} deliveries")
+                        continue
+                    self._loop.call_later(settings.EVENT_RETRY_DELAY_SECONDS, self._enqueue, (message_id, body, attempt + 1))
+        finally:
+            self._loop = None
+
+EVENT_BUS_BACKENDS = {
+    "eventbridge": EventBridgeEventBus,
+    "redis": RedisStreamEventBus,
+    "inprocess": InProcessEventBus,
+}
+
+event_bus = EVENT_BUS_BACKENDS[settings.EVENT_BUS_BACKEND]()
@@ -0,0 +1,105 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+import httpx
+from app.models.api import API
+from app.services import upstream_service
+from app.utils.logger import api_logger
+
+KEEPALIVE_EXPIRY_SECONDS = 30.0
+CLIENT_CLOSE_GRACE_SECONDS = 60.0
+
+class HTTPClientPool:
+    def __init__(self):
+        self._clients: Dict[int, Tuple[tuple, httpx.AsyncClient]] = {}
+        self._semaphores: Dict[int, Tuple[int, asyncio.Semaphore]] = {}
+        # Replaced clients waiting out their grace period. Holding the tasks
+        # also keeps them alive, since the loop only references them weakly.
+        self._closing: Dict[asyncio.Task, httpx.AsyncClient] = {}
+
+    def _client_config(self, api: API) -> tuple:
+        return (
+            id(asyncio.get_running_loop()),
+            api.http2_enabled,
+            api.max_connections,
+            api.connect_timeout,
+            api.read_timeout,
+            api.write_timeout,
+            api.pool_timeout
+        )
+
+    def get_client(self, api: API) -> httpx.AsyncClient:
+        config = self._client_config(api)
+        cached = self._clients.get(api.id)
+
+        if cached and cached[0] == config:
+            return cached[1]
+
+        client = httpx.AsyncClient(
+            http2=api.http2_enabled,
+            timeout=upstream_service.build_timeout(api),
+            limits=httpx.Limits(
+                max_connections=api.max_connections,
+                max_keepalive_connections=api.max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS
+            )
+        )
+        self._clients[api.id] = (config, client)
+
+        if cached:
+            task = asyncio.ensure_future(self._close_later(cached[1]))
+            self._closing[task] = cached[1]
+            task.add_done_callback(lambda done: self._closing.pop(done, None))
+
+        api_logger.info(f"Upstream client created: api_id={api.id}, http2={api.http2_enabled}, max_connections={api.max_connections}")
+        return client
+
+    def _get_semaphore(self, api: API) -> Optional[asyncio.Semaphore]:
+        if not api.max_concurrent_requests:
+            self._semaphores.pop(api.id, None)
+            return None
+
+        cached = self._semaphores.get(api.id)
+        if cached and cached[0] == api.max_concurrent_requests:
+            return cached[1]
+
+        semaphore = asyncio.Semaphore(api.max_concurrent_requests)
+        self._semaphores[api.id] = (api.max_concurrent_requests, semaphore)
+        return semaphore
+
+    @asynccontextmanager
+    async def concurrency_slot(self, api: API):
+        semaphore = self._get_semaphore(api)
+        if semaphore is None:
+            yield
+            return
+
+        async with semaphore:
+            yield
+
+    async def _close_quietly(self, client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+        except Exception as e:
+            api_logger.warning(f"Failed to close upstream client: {str(e)}")
+
+    async def _close_later(self, client: httpx.AsyncClient):
+        await asyncio.sleep(CLIENT_CLOSE_GRACE_SECONDS)
+        await self._close_quietly(client)
+
+    async def close_all(self):
+        clients = [client for _, client in self._clients.values()]
+        self._clients.clear()
+        self._semaphores.clear()
+
+        for client in clients:
+            await self._close_quietly(client)
+
+        closing = dict(self._closing)
+        for task in closing:
+            task.cancel()
+        await asyncio.gather(*closing, return_exceptions=True)
+        for client in closing.values():
+            await self._close_quietly(client)
+
+http_client_pool = HTTPClientPool()
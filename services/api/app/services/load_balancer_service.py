@@ -0,0 +1,151 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+import httpx
+from app.config import get_settings
+from app.core import database
+from app.models.api import API
+from app.models.upstream_target import UpstreamTarget
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+def _load_active_targets() -> List[UpstreamTarget]:
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        return db.query(UpstreamTarget).filter(UpstreamTarget.is_active == True).all()
+    finally:
+        db.close()
+
+class TargetState:
+    __slots__ = ("outstanding", "ewma_ms", "consecutive_failures", "unhealthy_until", "active_healthy")
+
+    def __init__(self):
+        self.outstanding = 0
+        self.ewma_ms: Optional[float] = None
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.active_healthy = True
+
+class LoadBalancer:
+    def __init__(self):
+        self._states: Dict[int, TargetState] = {}
+        self._current_weights: Dict[int, Dict[int, int]] = {}
+
+    def _state(self, target_id: int) -> TargetState:
+        state = self._states.get(target_id)
+        if state is None:
+            state = self._states[target_id] = TargetState()
+        return state
+
+    def is_healthy(self, target_id: int) -> bool:
+        state = self._states.get(target_id)
+        if state is None:
+            return True
+        return state.active_healthy and state.unhealthy_until <= time.monotonic()
+
+    def choose(
+        self,
+        api: API,
+        targets: Sequence[UpstreamTarget],
+        exclude: Sequence[int] = ()
+    ) -> UpstreamTarget:
+        candidates = [t for t in targets if t.id not in exclude and self.is_healthy(t.id)]
+        if not candidates:
+            candidates = [t for t in targets if t.id not in exclude] or list(targets)
+
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if api.load_balancing_strategy == "least_outstanding":
+            return self._least_outstanding(candidates)
+        if api.load_balancing_strategy == "latency_ewma":
+            return self._latency_ewma(candidates)
+        return self._round_robin(api.id, candidates)
+
+    def _round_robin(self, api_id: int, candidates: List[UpstreamTarget]) -> UpstreamTarget:
+        current = self._current_weights.setdefault(api_id, {})
+        total = 0
+        best = None
+
+        for target in candidates:
+            current[target.id] = current.get(target.id, 0) + target.weight
+            total += target.weight
+            if best is None or current[target.id] > current[best.id]:
+                best = target
+
+        current[best.id] -= total
+        return best
+
+    def _least_outstanding(self, candidates: List[UpstreamTarget]) -> UpstreamTarget:
+        return min(
+            candidates,
+            key=lambda t: (self._state(t.id).outstanding / t.weight, random.random())
+        )
+
+    def _latency_ewma(self, candidates: List[UpstreamTarget]) -> UpstreamTarget:
+        def cost(target: UpstreamTarget):
+            state = self._state(target.id)
+            if state.ewma_ms is None:
+                return (0.0, random.random())
+            return (state.ewma_ms * (state.outstanding + 1) / target.weight, random.random())
+
+        return min(candidates, key=cost)
+
+    def on_start(self, target_id: int):
+        self._state(target_id).outstanding += 1
+
+    def on_cancel(self, target_id: int):
+        state = self._state(target_id)
+        state.outstanding = max(0, state.outstanding - 1)
+
+    def on_finish(self, target_id: int, latency_ms: float, success: bool):
+        state = self._state(target_id)
+        state.outstanding = max(0, state.outstanding - 1)
+
+        if state.ewma_ms is None:
+            state.ewma_ms = latency_ms
+        else:
+            alpha = settings.UPSTREAM_EWMA_ALPHA
+            state.ewma_ms = alpha * latency_ms + (1 - alpha) * state.ewma_ms
+
+        if success:
+            state.consecutive_failures = 0
+            return
+
+        state.consecutive_failures += 1
+        if state.consecutive_failures >= settings.UPSTREAM_PASSIVE_FAILURE_THRESHOLD:
+            state.unhealthy_until = time.monotonic() + settings.UPSTREAM_PASSIVE_COOLDOWN_SECONDS
+            state.consecutive_failures = 0
+            api_logger.warning("Upstream target marked unhealthy after repeated failures: target_id=%s", target_id)
+
+    def set_active_health(self, target_id: int, healthy: bool):
+        state = self._state(target_id)
+        if state.active_healthy != healthy:
+            api_logger.warning("Upstream target health changed: target_id=%s, healthy=%s", target_id, healthy)
+        state.active_healthy = healthy
+
+    async def _check_target(self, client: httpx.AsyncClient, target: UpstreamTarget):
+        url = f"{target.url.rstrip('/')}/{settings.UPSTREAM_HEALTH_CHECK_PATH.lstrip('/')}"
+        try:
+            response = await client.get(url)
+            self.set_active_health(target.id, response.status_code < 500)
+        except httpx.RequestError:
+            self.set_active_health(target.id, False)
+
+    async def run_health_checks(self):
+        api_logger.info("Starting upstream target health checks")
+
+        async with httpx.AsyncClient(timeout=settings.UPSTREAM_HEALTH_CHECK_TIMEOUT_SECONDS) as client:
+            while True:
+                try:
+                    targets = await asyncio.to_thread(_load_active_targets)
+                    await asyncio.gather(*(self._check_target(client, target) for target in targets))
+                except Exception as e:
+                    api_logger.error(f"Upstream health check failed: {str(e)}")
+
+                await asyncio.sleep(settings.UPSTREAM_HEALTH_CHECK_INTERVAL_SECONDS)
+
+load_balancer = LoadBalancer()
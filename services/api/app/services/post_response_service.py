@@ -0,0 +1,85 @@
+import asyncio
+from typing import Callable, List, Tuple
+from fastapi import BackgroundTasks
+from app.core import database
+from app.utils.logger import api_logger
+
+class PostResponsePipeline:
+    def __init__(self):
+        self._jobs: List[Tuple[Callable, tuple, dict, bool]] = []
+
+    def add_job(self, job: Callable, *args, **kwargs):
+        self._jobs.append((job, args, kwargs, False))
+
+    def add_db_job(self, job: Callable, *args, **kwargs):
+        self._jobs.append((job, args, kwargs, True))
+
+    def run(self):
+        if not self._jobs:
+            return
+
+        db = None
+        try:
+            for job, args, kwargs, uses_db in self._jobs:
+                try:
+                    if uses_db:
+                        if db is None:
+                            database.init_db()
+                            db = database.SessionLocal()
+                        job(db, *args, **kwargs)
+                    else:
+                        job(*args, **kwargs)
+                except Exception as e:
+                    api_logger.error(f"Post-response job {job.__name__} failed: {str(e)}")
+                    if db is not None:
+                        db.rollback()
+        finally:
+            self._jobs.clear()
+            if db is not None:
+                db.close()
+
+def get_post_response_pipeline(background_tasks: BackgroundTasks) -> PostResponsePipeline:
+    pipeline = PostResponsePipeline()
+    background_tasks.add_task(pipeline.run)
+    return pipeline
+
+# Long-running servers run housekeeping (last_used flushes, metric pushes) on
+# a timer from the lifespan. Under Lambda there is no lifespan, so requests
+# piggyback the same jobs on their post-response pipeline instead.
+class PeriodicJobs:
+    def __init__(self):
+        self._jobs: List[Tuple[Callable, bool]] = []
+        self.running = False
+
+    def add_job(self, job: Callable):
+        self._jobs.append((job, False))
+
+    def add_db_job(self, job: Callable):
+        self._jobs.append((job, True))
+
+    def _add_to(self, pipeline: PostResponsePipeline):
+        for job, uses_db in self._jobs:
+            if uses_db:
+                pipeline.add_db_job(job)
+            else:
+                pipeline.add_job(job)
+
+    def piggyback(self, pipeline: PostResponsePipeline):
+        if not self.running:
+            self._add_to(pipeline)
+
+    def run_once(self):
+        pipeline = PostResponsePipeline()
+        self._add_to(pipeline)
+        pipeline.run()
+
+    async def run_forever(self, interval_seconds: float):
+        self.running = True
+        try:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                await asyncio.to_thread(self.run_once)
+        finally:
+            self.running = False
+
+periodic_jobs = PeriodicJobs()
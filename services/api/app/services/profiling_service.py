@@ -0,0 +1,245 @@
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from app.config import get_settings
+from app.services.redis_service import redis_service
+from app.utils import metrics
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+SESSION_KEY = "profiling:session"
+
+# Leaf frames in these modules (or these functions, which block inside C
+# calls) mean the thread is parked: event loop waiting on I/O, idle
+# threadpool worker, log listener. Such samples carry no CPU time.
+IDLE_MODULES = frozenset({"selectors", "threading", "queue"})
+IDLE_FRAMES = frozenset({
+    "concurrent.futures.thread:_worker",
+    "logging.handlers:QueueListener.dequeue",
+})
+
+TRUNCATED_FRAME = "[truncated]"
+
+_s3_client = None
+
+def get_s3_client():
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+
+        _s3_client = boto3.client('s3')
+    return _s3_client
+
+def _frame_name(frame) -> str:
+    module = frame.f_globals.get("__name__", frame.f_code.co_filename)
+    return f"{module}:{frame.f_code.co_qualname}"
+
+def _is_idle(frame) -> bool:
+    return frame.f_globals.get("__name__") in IDLE_MODULES or _frame_name(frame) in IDLE_FRAMES
+
+class StackSampler:
+    def __init__(self):
+        self._stacks: Counter = Counter()
+        self._active: Dict[int, str] = {}
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+        self._sampling = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._samples = 0
+        self._window_started = time.time()
+        self._last_flush = time.monotonic()
+
+    def start(self, label: str) -> int:
+        token = next(self._tokens)
+
+        with self._lock:
+            self._active[token] = label
+            self._sampling.set()
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="apiverse-profiler", daemon=True)
+                self._thread.start()
+
+        return token
+
+    def stop(self, token: int):
+        with self._lock:
+            self._active.pop(token, None)
+            if not self._active:
+                self._sampling.clear()
+
+    def _run(self):
+        while True:
+            if self._sampling.wait(timeout=settings.PROFILING_FLUSH_INTERVAL_SECONDS):
+                self._sample()
+                time.sleep(settings.PROFILING_INTERVAL_SECONDS)
+
+            if time.monotonic() - self._last_flush >= settings.PROFILING_FLUSH_INTERVAL_SECONDS:
+                self.flush()
+
+    def _sample(self):
+        with self._lock:
+            label = "+".join(sorted(set(self._active.values())))
+        if not label:
+            return
+
+        own_ident = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident or _is_idle(frame):
+                continue
+
+            stack = []
+            while frame is not None and len(stack) < settings.PROFILING_MAX_DEPTH:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if frame is not None:
+                stack.append(TRUNCATED_FRAME)
+            stack.reverse()
+
+            key = ";".join([label, thread_names.get(ident, "thread"), *stack])
+
+            with self._lock:
+                if key not in self._stacks and len(self._stacks) >= settings.PROFILING_MAX_STACKS:
+                    key = f"{label};{TRUNCATED_FRAME}"
+                self._stacks[key] += 1
+                self._samples += 1
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "active_requests": len(self._active),
+                "samples": self._samples,
+                "distinct_stacks": len(self._stacks),
+                "window_started_at": datetime.fromtimestamp(self._window_started, tz=timezone.utc),
+            }
+
+    def collapsed(self, reset: bool = False) -> str:
+        with self._lock:
+            stacks = self._stacks if reset else Counter(self._stacks)
+            if reset:
+                self._reset()
+
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+
+    def _reset(self):
+        self._stacks = Counter()
+        self._samples = 0
+        self._window_started = time.time()
+
+    def flush(self) -> bool:
+        self._last_flush = time.monotonic()
+
+        if not settings.PROFILING_SINK:
+            return False
+
+        with self._lock:
+            window_started = self._window_started
+            stacks = self._stacks
+            self._reset()
+
+        if not stacks:
+            return False
+
+        content = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        try:
+            _write_to_sink(content, window_started)
+            return True
+        except Exception as e:
+            api_logger.error(f"Failed to ship profile to {settings.PROFILING_SINK}: {str(e)}")
+            return False
+
+def _write_to_sink(content: str, window_started: float):
+    sink = settings.PROFILING_SINK
+    started = datetime.fromtimestamp(window_started, tz=timezone.utc)
+    name = f"{started:%Y%m%dT%H%M%SZ}-{os.getpid()}-{uuid.uuid4().hex[:8]}.collapsed"
+
+    if sink == "log":
+        api_logger.info("Profile window", extra={"profile_started_at": started.isoformat(), "collapsed_stacks": content})
+    elif sink.startswith("file://"):
+        directory = sink[len("file://"):]
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(content)
+    elif sink.startswith("s3://"):
+        bucket, _, prefix = sink[len("s3://"):].partition("/")
+        key = f"{prefix.rstrip('/')}/{name}" if prefix else name
+        get_s3_client().put_object(Bucket=bucket, Key=key, Body=content.encode(), ContentType="text/plain")
+    else:
+        raise ValueError(f"Unsupported profiling sink: {sink}")
+
+    api_logger.info(f"Shipped profile window started {started.isoformat()} to {sink}")
+
+class ProfilingControl:
+    def __init__(self):
+        self._session: Optional[dict] = None
+        self._refreshed_at = 0.0
+
+    def _effective_rate(self) -> float:
+        if self._session is not None and self._session["expires_at"] > time.time():
+            return self._session["sample_rate"]
+        return settings.PROFILING_SAMPLE_RATE
+
+    async def sample_rate(self) -> float:
+        now = time.monotonic()
+        if now - self._refreshed_at < settings.PROFILING_CONTROL_REFRESH_SECONDS:
+            return self._effective_rate()
+        self._refreshed_at = now
+
+        try:
+            raw = await redis_service.get_async_client().get(SESSION_KEY)
+            self._session = json.loads(raw) if raw else None
+        except Exception as e:
+            metrics.record_backend_error("redis", "profiling")
+            api_logger.error(f"Redis error reading profiling session: {str(e)}")
+
+        return self._effective_rate()
+
+    def start_session(self, sample_rate: float, duration_seconds: int) -> dict:
+        session = {
+            "sample_rate": sample_rate,
+            "expires_at": time.time() + duration_seconds,
+        }
+        redis_service.get_client().set(SESSION_KEY, json.dumps(session), ex=duration_seconds)
+        self._session = session
+        return session
+
+    def stop_session(self):
+        redis_service.get_client().delete(SESSION_KEY)
+        self._session = None
+
+    def get_session(self) -> Optional[dict]:
+        raw = redis_service.get_client().get(SESSION_KEY)
+        self._session = json.loads(raw) if raw else None
+        return self._session
+
+sampler = StackSampler()
+profiling_control = ProfilingControl()
+
+def profiled(label: str):
+    async def profile_request():
+        if not settings.PROFILING_ENABLED or random.random() >= await profiling_control.sample_rate():
+            yield
+            return
+
+        token = sampler.start(label)
+        try:
+            yield
+        finally:
+            sampler.stop(token)
+
+    return profile_request
+
+def flush_on_shutdown():
+    if settings.PROFILING_ENABLED:
+        sampler.flush()
@@ -0,0 +1,196 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from app.config import get_settings
+from app.models.rate_limit import RateLimit
+from app.services.redis_service import redis_service
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+# Returns unused tokens to the window counters. A window key that has already
+# expired is left alone instead of being recreated as a negative counter
+# without a TTL.
+RELEASE_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    if redis.call('EXISTS', key) == 1 then
+        redis.call('DECRBY', key, ARGV[1])
+    end
+end
+return 0
+"""
+
+def _queue_release(pipe, lease: "QuotaLease"):
+    pipe.eval(RELEASE_SCRIPT, 2, lease.hour_key, lease.day_key, lease.tokens)
+
+class QuotaLease:
+    def __init__(
+        self,
+        hour_key: str,
+        day_key: str,
+        limits: Tuple[int, int],
+        tokens: int,
+        hour_count: int,
+        day_count: int,
+        expires_at: float
+    ):
+        self.hour_key = hour_key
+        self.day_key = day_key
+        self.limits = limits
+        self.tokens = tokens
+        self.hour_count = hour_count
+        self.day_count = day_count
+        self.expires_at = expires_at
+
+    def is_valid_for(self, hour_key: str, day_key: str, limits: Tuple[int, int], now: float) -> bool:
+        return (
+            self.hour_key == hour_key
+            and self.day_key == day_key
+            and self.limits == limits
+            and now < self.expires_at
+        )
+
+class QuotaLeaseManager:
+    def __init__(self):
+        self._leases: Dict[Tuple[int, int], QuotaLease] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def applies(self, rate_limit: RateLimit) -> bool:
+        return (
+            settings.RATE_LIMIT_LEASING_ENABLED
+            and rate_limit.requests_per_hour >= settings.RATE_LIMIT_LEASE_MIN_LIMIT
+            and rate_limit.requests_per_day >= settings.RATE_LIMIT_LEASE_MIN_LIMIT
+        )
+
+    def consume(
+        self,
+        lease_key: Tuple[int, int],
+        hour_key: str,
+        day_key: str,
+        limits: Tuple[int, int]
+    ) -> Optional[Tuple[int, int]]:
+        with self._lock:
+            lease = self._leases.get(lease_key)
+            if lease is None or lease.tokens <= 0:
+                return None
+            if not lease.is_valid_for(hour_key, day_key, limits, time.monotonic()):
+                return None
+
+            lease.tokens -= 1
+            return lease.hour_count - lease.tokens, lease.day_count - lease.tokens
+
+    def _lease_size(self, previous: Optional[QuotaLease], limits: Tuple[int, int]) -> int:
+        if previous is not None:
+            remaining = min(limits[0] - previous.hour_count, limits[1] - previous.day_count)
+        else:
+            remaining = min(limits)
+
+        size = int(remaining * settings.RATE_LIMIT_LEASE_FRACTION)
+        return max(1, min(size, settings.RATE_LIMIT_LEASE_MAX_SIZE))
+
+    async def acquire(
+        self,
+        lease_key: Tuple[int, int],
+        hour_key: str,
+        day_key: str,
+        limits: Tuple[int, int]
+    ) -> Tuple[int, int, int]:
+        with self._lock:
+            previous = self._leases.pop(lease_key, None)
+
+        size = self._lease_size(previous, limits)
+        redis_client = redis_service.get_async_client()
+
+        pipe = redis_client.pipeline()
+        if previous is not None and previous.tokens > 0:
+            _queue_release(pipe, previous)
+        pipe.incrby(hour_key, size)
+        pipe.expire(hour_key, 3600)
+        pipe.incrby(day_key, size)
+        pipe.expire(day_key, 86400)
+        results = await pipe.execute()
+        hour_count, day_count = results[-4], results[-2]
+
+        overshoot = max(hour_count - limits[0], day_count - limits[1], 0)
+        granted = max(0, size - overshoot)
+        excess = size - granted
+        if excess:
+            pipe = redis_client.pipeline()
+            pipe.decrby(hour_key, excess)
+            pipe.decrby(day_key, excess)
+            await pipe.execute()
+            hour_count -= excess
+            day_count -= excess
+
+        if granted == 0:
+            return 0, hour_count, day_count
+
+        lease = QuotaLease(
+            hour_key,
+            day_key,
+            limits,
+            granted - 1,
+            hour_count,
+            day_count,
+            time.monotonic() + settings.RATE_LIMIT_LEASE_SECONDS
+        )
+
+        with self._lock:
+            current = self._leases.get(lease_key)
+            if current is not None and current.hour_key == hour_key and current.day_key == day_key:
+                lease.tokens += current.tokens
+                lease.hour_count = max(lease.hour_count, current.hour_count)
+                lease.day_count = max(lease.day_count, current.day_count)
+            self._leases[lease_key] = lease
+
+        api_logger.debug("Quota lease acquired: key=%s, granted=%s, hour=%s/%s, day=%s/%s", lease_key, granted, hour_count, limits[0], day_count, limits[1])
+        return granted, hour_count - lease.tokens, day_count - lease.tokens
+
+    # A lease whose key is not requested again would otherwise hold its tokens
+    # until shutdown, which never comes on Lambda. Runs as a periodic job.
+    def release_expired_if_due(self):
+        if not settings.RATE_LIMIT_LEASING_ENABLED:
+            return
+
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + settings.RATE_LIMIT_LEASE_SECONDS
+
+        with self._lock:
+            expired = [key for key, lease in self._leases.items() if lease.expires_at <= now]
+            leases = [self._leases.pop(key) for key in expired]
+
+        leases = [lease for lease in leases if lease.tokens > 0]
+        if not leases:
+            return
+
+        try:
+            pipe = redis_service.get_client().pipeline()
+            for lease in leases:
+                _queue_release(pipe, lease)
+            pipe.execute()
+            api_logger.debug("Released %s expired quota leases", len(leases))
+        except Exception as e:
+            api_logger.error(f"Redis error releasing expired quota leases: {str(e)}")
+
+    async def release_all(self):
+        with self._lock:
+            leases = list(self._leases.values())
+            self._leases.clear()
+
+        leases = [lease for lease in leases if lease.tokens > 0]
+        if not leases:
+            return
+
+        try:
+            pipe = redis_service.get_async_client().pipeline()
+            for lease in leases:
+                _queue_release(pipe, lease)
+            await pipe.execute()
+            api_logger.info(f"Released {len(leases)} unused quota leases")
+        except Exception as e:
+            api_logger.error(f"Redis error releasing quota leases: {str(e)}")
+
+quota_leases = QuotaLeaseManager()
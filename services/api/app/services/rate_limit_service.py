@@ -1,12 +1,17 @@
 import time
 from typing import Optional, Tuple
 from sqlalchemy.orm import Session
+from app.config import get_settings
 from app.models.rate_limit import RateLimit
 from app.models.api import API
 from app.models.user import User
 from app.services.redis_service import redis_service
+from app.services.quota_lease_service import quota_leases
+from app.utils import metrics
 from app.utils.logger import api_logger
 
+settings = get_settings()
+
 def get_or_create_rate_limit(db: Session, api_id: int) -> RateLimit:
     rate_limit = db.query(RateLimit).filter(RateLimit.api_id == api_id).first()
     
@@ -24,21 +29,75 @@ def get_or_create_rate_limit(db: Session, api_id: int) -> RateLimit:
     
     return rate_limit
 
-def check_rate_limit(
+def _rate_limit_info(rate_limit: RateLimit, current_time: int, hour_used: int, day_used: int) -> dict:
+    return {
+        "limit_hour": rate_limit.requests_per_hour,
+        "remaining_hour": max(0, rate_limit.requests_per_hour - hour_used),
+        "reset_hour": ((current_time // 3600) + 1) * 3600,
+        "limit_day": rate_limit.requests_per_day,
+        "remaining_day": max(0, rate_limit.requests_per_day - day_used),
+        "reset_day": ((current_time // 86400) + 1) * 86400
+    }
+
+def _on_redis_error(rate_limit: RateLimit, error: Exception) -> Tuple[bool, Optional[dict]]:
+    metrics.record_backend_error("redis", "rate_limit")
+
+    if rate_limit.tier in settings.RATE_LIMIT_FAIL_CLOSED_TIERS:
+        api_logger.error("Redis error in rate limiting, failing closed: tier=%s, error=%s", rate_limit.tier, error)
+        return False, None
+
+    api_logger.error("Redis error in rate limiting: %s", error)
+    return True, None
+
+async def _check_leased_rate_limit(
+    rate_limit: RateLimit,
+    api_id: int,
+    api_key_id: int,
+    current_time: int,
+    hour_key: str,
+    day_key: str
+) -> Tuple[bool, Optional[dict]]:
+    lease_key = (api_id, api_key_id)
+    limits = (rate_limit.requests_per_hour, rate_limit.requests_per_day)
+
+    usage = quota_leases.consume(lease_key, hour_key, day_key, limits)
+    metrics.record_cache("quota_lease", usage is not None)
+    if usage is not None:
+        return True, _rate_limit_info(rate_limit, current_time, *usage)
+
+    try:
+        granted, hour_used, day_used = await quota_leases.acquire(lease_key, hour_key, day_key, limits)
+    except Exception as e:
+        return _on_redis_error(rate_limit, e)
+
+    if not granted:
+        api_logger.warning(
+            "Rate limit exceeded: api_id=%s, key_id=%s, hour=%s/%s, day=%s/%s",
+            api_id, api_key_id,
+            hour_used, rate_limit.requests_per_hour,
+            day_used, rate_limit.requests_per_day
+        )
+        return False, _rate_limit_info(rate_limit, current_time, hour_used, day_used)
+
+    return True, _rate_limit_info(rate_limit, current_time, hour_used, day_used)
+
+async def check_rate_limit(
     db: Session,
     api_id: int,
     api_key_id: int
 ) -> Tuple[bool, Optional[dict]]:
     rate_limit = get_or_create_rate_limit(db, api_id)
-    redis_client = redis_service.get_client()
+    redis_client = redis_service.get_async_client()
     
     current_time = int(time.time())
     hour_key = f"rate_limit:api:{api_id}:key:{api_key_id}:hour:{current_time // 3600}"
     day_key = f"rate_limit:api:{api_id}:key:{api_key_id}:day:{current_time // 86400}"
+
+    if quota_leases.applies(rate_limit):
+        return await _check_leased_rate_limit(rate_limit, api_id, api_key_id, current_time, hour_key, day_key)
     
     try:
-        hour_count = redis_client.get(hour_key)
-        day_count = redis_client.get(day_key)
+        hour_count, day_count = await redis_client.mget(hour_key, day_key)
         
         hour_count = int(hour_count) if hour_count else 0
         day_count = int(day_count) if day_count else 0
@@ -48,9 +107,10 @@ def check_rate_limit(
         
         if hour_exceeded or day_exceeded:
             api_logger.warning(
-                f"Rate limit exceeded: api_id={api_id}, key_id={api_key_id}, "
-                f"hour={hour_count}/{rate_limit.requests_per_hour}, "
-                f"day={day_count}/{rate_limit.requests_per_day}"
+                "Rate limit exceeded: api_id=%s, key_id=%s, hour=%s/%s, day=%s/%s",
+                api_id, api_key_id,
+                hour_count, rate_limit.requests_per_hour,
+                day_count, rate_limit.requests_per_day
             )
             
             hour_reset = ((current_time // 3600) + 1) * 3600
@@ -70,7 +130,7 @@ def check_rate_limit(
         pipe.expire(hour_key, 3600)
         pipe.incr(day_key)
         pipe.expire(day_key, 86400)
-        pipe.execute()
+        await pipe.execute()
         
         hour_reset = ((current_time // 3600) + 1) * 3600
         day_reset = ((current_time // 86400) + 1) * 86400
@@ -85,16 +145,16 @@ def check_rate_limit(
         }
         
         api_logger.debug(
-            f"Rate limit check passed: api_id={api_id}, key_id={api_key_id}, "
-            f"hour={hour_count + 1}/{rate_limit.requests_per_hour}, "
-            f"day={day_count + 1}/{rate_limit.requests_per_day}"
+            "Rate limit check passed: api_id=%s, key_id=%s, hour=%s/%s, day=%s/%s",
+            api_id, api_key_id,
+            hour_count + 1, rate_limit.requests_per_hour,
+            day_count + 1, rate_limit.requests_per_day
         )
         
         return True, rate_limit_info
         
     except Exception as e:
-        api_logger.error(f"Redis error in rate limiting: {str(e)}")
-        return True, None
+        return _on_redis_error(rate_limit, e)
 
 def create_rate_limit(
     db: Session,
@@ -0,0 +1,65 @@
+import time
+from typing import Dict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.core import database
+from app.services.redis_service import redis_service
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+class ReadReplicaGuard:
+    def __init__(self):
+        self._recent_writes: Dict[int, float] = {}
+
+    def _key(self, user_id: int) -> str:
+        return f"db:recent_write:user:{user_id}"
+
+    def mark_write(self, user_id: int):
+        self._recent_writes[user_id] = time.monotonic()
+
+        try:
+            redis_service.get_client().set(
+                self._key(user_id),
+                1,
+                px=max(1, int(settings.READ_REPLICA_STALENESS_SECONDS * 1000))
+            )
+        except Exception as e:
+            api_logger.error(f"Redis error recording recent write: {str(e)}")
+
+    def has_recent_write(self, user_id: int) -> bool:
+        written_at = self._recent_writes.get(user_id)
+        if written_at is not None:
+            if time.monotonic() - written_at < settings.READ_REPLICA_STALENESS_SECONDS:
+                return True
+            self._recent_writes.pop(user_id, None)
+
+        try:
+            return bool(redis_service.get_client().exists(self._key(user_id)))
+        except Exception as e:
+            api_logger.error(f"Redis error checking recent write: {str(e)}")
+            return True
+
+read_replica_guard = ReadReplicaGuard()
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    session.info["has_writes"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+@event.listens_for(Session, "after_commit")
+def _mark_recent_write(session):
+    has_writes = session.info.pop("has_writes", False)
+    user_id = session.info.get("user_id")
+
+    if has_writes and user_id is not None and database.read_replica_configured():
+        read_replica_guard.mark_write(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _reset_writes(session):
+    session.info.pop("has_writes", None)
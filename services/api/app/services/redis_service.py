@@ -1,10 +1,16 @@
+import asyncio
 import redis
-import os
+import redis.asyncio as aioredis
+from app.config import get_settings
 from app.utils.logger import api_logger
 
+settings = get_settings()
+
 class RedisService:
     _instance = None
     _client = None
+    _async_client = None
+    _async_loop_id = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -13,20 +19,68 @@ class RedisService:
 
     def get_client(self) -> redis.Redis:
         if self._client is None:
-            redis_host = os.environ.get('REDIS_HOST', 'localhost')
-            redis_port = int(os.environ.get('REDIS_PORT', 6379))
-            
-            self._client = redis.Redis(
-                host=redis_host,
-                port=redis_port,
+            pool = redis.BlockingConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
                 decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+                socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS
             )
-            api_logger.info(f"Redis client initialized: {redis_host}:{redis_port}")
-        
+            self._client = redis.Redis.from_pool(pool)
+            api_logger.info(f"Redis client initialized: {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+
         return self._client
 
+    def get_async_client(self) -> aioredis.Redis:
+        loop_id = id(asyncio.get_running_loop())
+
+        if self._async_client is None or self._async_loop_id != loop_id:
+            pool = aioredis.BlockingConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+                socket_connect_timeout=settings.REDIS_HOT_PATH_CONNECT_TIMEOUT_SECONDS,
+                socket_timeout=settings.REDIS_HOT_PATH_TIMEOUT_SECONDS,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS
+            )
+            self._async_client = aioredis.Redis.from_pool(pool)
+            self._async_loop_id = loop_id
+            api_logger.info(f"Async Redis client initialized: {settings.REDIS_HOST}:{settings.REDIS_PORT}, max_connections={settings.REDIS_MAX_CONNECTIONS}")
+
+        return self._async_client
+
+    # Dedicated client for blocking commands (XREADGROUP BLOCK), which would
+    # trip the hot-path socket timeout. The caller owns and closes it.
+    def create_async_client(self, socket_timeout: float) -> aioredis.Redis:
+        return aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT_SECONDS,
+            socket_timeout=socket_timeout,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS
+        )
+
+    async def connect(self):
+        try:
+            await self.get_async_client().ping()
+        except Exception as e:
+            api_logger.error(f"Redis ping failed on startup: {str(e)}")
+
+    async def aclose(self):
+        if self._async_client is not None:
+            try:
+                await self._async_client.aclose()
+            except Exception as e:
+                api_logger.warning(f"Failed to close async Redis client: {str(e)}")
+            self._async_client = None
+            self._async_loop_id = None
+
     def close(self):
         if self._client:
             self._client.close()
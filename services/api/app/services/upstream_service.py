@@ -0,0 +1,215 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence
+import httpx
+from app.models.api import API
+from app.models.upstream_target import UpstreamTarget
+from app.services.load_balancer_service import load_balancer
+from app.utils.logger import api_logger, proxy_logger
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+
+LATENCY_SAMPLE_SIZE = 200
+LATENCY_MIN_SAMPLES = 20
+
+class LatencyTracker:
+    def __init__(self, sample_size: int = LATENCY_SAMPLE_SIZE):
+        self._sample_size = sample_size
+        self._samples: Dict[int, Deque[float]] = {}
+
+    def record(self, api_id: int, latency_ms: float):
+        samples = self._samples.get(api_id)
+        if samples is None:
+            samples = self._samples[api_id] = deque(maxlen=self._sample_size)
+        samples.append(latency_ms)
+
+    def percentile(self, api_id: int, percentile: float) -> Optional[float]:
+        samples = self._samples.get(api_id)
+        if not samples or len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile))
+        return ordered[index]
+
+latency_tracker = LatencyTracker()
+
+def build_timeout(api: API) -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=api.connect_timeout,
+        read=api.read_timeout,
+        write=api.write_timeout,
+        pool=api.pool_timeout
+    )
+
+def _is_retryable_error(error: httpx.RequestError, method: str) -> bool:
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    return method in IDEMPOTENT_METHODS and isinstance(error, httpx.TransportError)
+
+def _backoff_seconds(api: API, attempt: int) -> float:
+    return random.uniform(0, api.retry_backoff_ms * (2 ** attempt)) / 1000
+
+async def _send_once(
+    client: httpx.AsyncClient,
+    api: API,
+    targets: Sequence[UpstreamTarget],
+    tried: List[int],
+    method: str,
+    path: str,
+    request_kwargs: dict
+) -> httpx.Response:
+    target = load_balancer.choose(api, targets, exclude=tried) if targets else None
+    base_url = target.url if target else api.base_url
+    request = client.build_request(
+        method=method,
+        url=f"{base_url.rstrip('/')}/{path.lstrip('/')}",
+        **request_kwargs
+    )
+
+    if target is None:
+        return await client.send(request, stream=True)
+
+    tried.append(target.id)
+    load_balancer.on_start(target.id)
+    started = time.perf_counter()
+    success = False
+    try:
+        response = await client.send(request, stream=True)
+        success = response.status_code < 500
+    except asyncio.CancelledError:
+        # The losing leg of a hedge: says nothing about the target's health or
+        # latency, so only release its outstanding slot.
+        load_balancer.on_cancel(target.id)
+        raise
+    except BaseException:
+        load_balancer.on_finish(target.id, (time.perf_counter() - started) * 1000, False)
+        raise
+
+    load_balancer.on_finish(target.id, (time.perf_counter() - started) * 1000, success)
+    return response
+
+async def _send_with_retries(
+    client: httpx.AsyncClient,
+    api: API,
+    targets: Sequence[UpstreamTarget],
+    method: str,
+    path: str,
+    request_kwargs: dict
+) -> httpx.Response:
+    attempt = 0
+    tried: List[int] = []
+
+    while True:
+        started = time.perf_counter()
+        try:
+            response = await _send_once(client, api, targets, tried, method, path, request_kwargs)
+        except httpx.RequestError as e:
+            if attempt >= api.max_retries or not _is_retryable_error(e, method):
+                raise
+            api_logger.warning("Retrying upstream request after %s: api_id=%s, attempt=%s", type(e).__name__, api.id, attempt + 1)
+        else:
+            if (
+                response.status_code in RETRYABLE_STATUS_CODES
+                and method in IDEMPOTENT_METHODS
+                and attempt < api.max_retries
+            ):
+                await response.aclose()
+                api_logger.warning("Retrying upstream request after status %s: api_id=%s, attempt=%s", response.status_code, api.id, attempt + 1)
+            else:
+                if response.status_code < 500:
+                    latency_tracker.record(api.id, (time.perf_counter() - started) * 1000)
+                return response
+
+        if len(tried) >= len(targets):
+            tried.clear()
+
+        await asyncio.sleep(_backoff_seconds(api, attempt))
+        attempt += 1
+
+def _hedge_delay_seconds(api: API) -> Optional[float]:
+    if api.hedge_delay_ms:
+        return api.hedge_delay_ms / 1000
+
+    p95 = latency_tracker.percentile(api.id, 0.95)
+    return p95 / 1000 if p95 is not None else None
+
+# Cancels legs that are no longer wanted. One that finished before it could
+# be cancelled returned a streamed response, which is closed so its
+# connection goes back to the pool.
+async def _abandon(tasks):
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        if task.done() and not task.cancelled() and task.exception() is None:
+            await task.result().aclose()
+
+async def _send_hedged(
+    client: httpx.AsyncClient,
+    api: API,
+    targets: Sequence[UpstreamTarget],
+    method: str,
+    path: str,
+    request_kwargs: dict,
+    delay: float
+) -> httpx.Response:
+    primary = asyncio.ensure_future(_send_with_retries(client, api, targets, method, path, request_kwargs))
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+    except BaseException:
+        # The outer request was cancelled (e.g. client disconnect) before the
+        # hedge delay: the primary leg must not keep holding a connection.
+        await _abandon({primary})
+        raise
+    if done:
+        return primary.result()
+
+    proxy_logger.info("Hedging upstream request: api_id=%s, delay=%.0fms", api.id, delay * 1000)
+    hedge = asyncio.ensure_future(_send_with_retries(client, api, targets, method, path, request_kwargs))
+    pending = {primary, hedge}
+    error: Optional[BaseException] = None
+
+    winner: Optional[httpx.Response] = None
+
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif winner is None:
+                    winner = task.result()
+                else:
+                    await task.result().aclose()
+    finally:
+        await _abandon(pending)
+
+    if winner is None:
+        raise error
+    return winner
+
+async def send(
+    client: httpx.AsyncClient,
+    api: API,
+    targets: Sequence[UpstreamTarget],
+    method: str,
+    path: str,
+    headers,
+    params,
+    content: bytes
+) -> httpx.Response:
+    request_kwargs = {
+        "headers": headers,
+        "params": params,
+        "content": content
+    }
+
+    if api.hedging_enabled and method in IDEMPOTENT_METHODS:
+        delay = _hedge_delay_seconds(api)
+        if delay is not None:
+            return await _send_hedged(client, api, targets, method, path, request_kwargs, delay)
+
+    return await _send_with_retries(client, api, targets, method, path, request_kwargs)
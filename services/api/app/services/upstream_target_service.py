@@ -0,0 +1,135 @@
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.api import API
+from app.models.upstream_target import UpstreamTarget
+from app.models.user import User
+from app.utils import metrics
+from app.utils.cache import TTLCache
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+# Active targets per api_id for the proxy. Entries are transient copies, so
+# they are safe to share across requests and sessions; other containers pick
+# up changes within UPSTREAM_TARGET_CACHE_TTL_SECONDS.
+active_targets_cache = TTLCache(
+    maxsize=settings.UPSTREAM_TARGET_CACHE_MAX_SIZE,
+    ttl=settings.UPSTREAM_TARGET_CACHE_TTL_SECONDS
+)
+
+def invalidate_active_targets(api_id: int):
+    active_targets_cache.pop(api_id)
+
+@event.listens_for(UpstreamTarget, "after_insert")
+@event.listens_for(UpstreamTarget, "after_update")
+@event.listens_for(UpstreamTarget, "after_delete")
+def _invalidate_cached_targets(mapper, connection, target: UpstreamTarget):
+    invalidate_active_targets(target.api_id)
+
+def create_target(
+    db: Session,
+    api_id: int,
+    user: User,
+    url: str,
+    weight: int = 1,
+    is_active: bool = True
+) -> UpstreamTarget:
+    api = db.query(API).filter(API.id == api_id, API.user_id == user.id).first()
+    if not api:
+        raise ValueError("API not found or access denied")
+
+    target = UpstreamTarget(
+        api_id=api_id,
+        url=url,
+        weight=weight,
+        is_active=is_active
+    )
+
+    db.add(target)
+    db.commit()
+    db.refresh(target)
+
+    api_logger.info(f"Created upstream target: id={target.id}, api_id={api_id}, url={url}")
+    return target
+
+def get_targets(db: Session, api_id: int, user: User) -> List[UpstreamTarget]:
+    api = db.query(API).filter(API.id == api_id, API.user_id == user.id).first()
+    if not api:
+        return []
+
+    return db.query(UpstreamTarget).filter(
+        UpstreamTarget.api_id == api_id
+    ).order_by(UpstreamTarget.id).all()
+
+def get_active_targets(db: Session, api_id: int) -> List[UpstreamTarget]:
+    cached = active_targets_cache.get(api_id)
+    metrics.record_cache("upstream_targets", cached is not None)
+    if cached is not None:
+        return cached
+
+    targets = db.query(UpstreamTarget).filter(
+        UpstreamTarget.api_id == api_id,
+        UpstreamTarget.is_active == True
+    ).all()
+    cached = [
+        UpstreamTarget(id=t.id, api_id=t.api_id, url=t.url, weight=t.weight, is_active=t.is_active)
+        for t in targets
+    ]
+    active_targets_cache.set(api_id, cached)
+    return cached
+
+def get_target(
+    db: Session,
+    api_id: int,
+    target_id: int,
+    user: User
+) -> Optional[UpstreamTarget]:
+    return db.query(UpstreamTarget).join(API).filter(
+        UpstreamTarget.id == target_id,
+        UpstreamTarget.api_id == api_id,
+        API.user_id == user.id
+    ).first()
+
+def update_target(
+    db: Session,
+    api_id: int,
+    target_id: int,
+    user: User,
+    url: Optional[str] = None,
+    weight: Optional[int] = None,
+    is_active: Optional[bool] = None
+) -> Optional[UpstreamTarget]:
+    target = get_target(db, api_id, target_id, user)
+    if not target:
+        return None
+
+    if url is not None:
+        target.url = url
+    if weight is not None:
+        target.weight = weight
+    if is_active is not None:
+        target.is_active = is_active
+
+    db.commit()
+    db.refresh(target)
+
+    api_logger.info(f"Updated upstream target: id={target_id}, api_id={api_id}")
+    return target
+
+def delete_target(
+    db: Session,
+    api_id: int,
+    target_id: int,
+    user: User
+) -> bool:
+    target = get_target(db, api_id, target_id, user)
+    if not target:
+        return False
+
+    db.delete(target)
+    db.commit()
+
+    api_logger.info(f"Deleted upstream target: id={target_id}, api_id={api_id}")
+    return True
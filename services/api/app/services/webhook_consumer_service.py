@@ -0,0 +1,215 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import httpx
+from sqlalchemy import insert
+from app.config import get_settings
+from app.core import database
+from app.models.webhook_delivery import WebhookDelivery
+from app.models.webhook_subscription import WebhookSubscription
+from app.services.event_bus_service import Message
+from app.services.webhook_service import generate_signature
+from app.utils import metrics, tracing
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+# (subscription id, url, secret), detached from the session so no connection
+# is held while deliveries are in flight.
+Target = Tuple[int, str, Optional[str]]
+
+def is_sqs_event(event) -> bool:
+    records = event.get("Records") if isinstance(event, dict) else None
+    return bool(records) and records[0].get("eventSource") == "aws:sqs"
+
+def parse_message(message_id: str, body: str, attempt: int) -> dict:
+    event = json.loads(body)
+    # The EventBridge rule delivers the whole event envelope; what
+    # webhook_service.publish_event sent is its "detail".
+    detail = event.get("detail", event)
+
+    return {
+        "message_id": message_id,
+        "event_type": detail["event_type"],
+        "api_id": int(detail["api_id"]),
+        "payload": detail.get("payload", {}),
+        "trace_context": detail.get("trace_context"),
+        "attempt": attempt,
+    }
+
+def sqs_message(record: dict) -> Message:
+    return (
+        record["messageId"],
+        record["body"],
+        int(record.get("attributes", {}).get("ApproximateReceiveCount", 1))
+    )
+
+def resolve_targets(api_ids: Iterable[int]) -> Dict[Tuple[int, str], List[Target]]:
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        subscriptions = db.query(WebhookSubscription).filter(
+            WebhookSubscription.api_id.in_(list(api_ids)),
+            WebhookSubscription.is_active == True
+        ).all()
+
+        targets = defaultdict(list)
+        for subscription in subscriptions:
+            for event_type in subscription.events or []:
+                targets[(subscription.api_id, event_type)].append(
+                    (subscription.id, subscription.url, subscription.secret)
+                )
+        return targets
+    finally:
+        db.close()
+
+def is_retryable(status_code: Optional[int]) -> bool:
+    return status_code is None or status_code == 429 or status_code >= 500
+
+async def deliver(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    event: dict,
+    target: Target
+) -> dict:
+    subscription_id, url, secret = target
+    payload_str = json.dumps(event["payload"])
+
+    # X-Webhook-Id is the event bus message id, which stays the same when a
+    # failed message is redelivered, so receivers can de-duplicate on it.
+    headers = {
+        'Content-Type': 'application/json',
+        'X-Webhook-Event': event["event_type"],
+        'X-Webhook-Id': event["message_id"],
+    }
+    if secret:
+        headers['X-Webhook-Signature'] = f'sha256={generate_signature(payload_str, secret)}'
+
+    row = {
+        "subscription_id": subscription_id,
+        "event_type": event["event_type"],
+        "payload": payload_str,
+        "attempt_count": event["attempt"],
+        "response_status_code": None,
+        "error_message": None,
+        "delivered_at": None,
+    }
+
+    async with semaphore:
+        with tracing.extracted_context(event["trace_context"]), tracing.span(
+            "webhook.deliver",
+            {"apiverse.api_id": event["api_id"], "apiverse.subscription_id": subscription_id}
+        ):
+            try:
+                response = await client.post(url, content=payload_str, headers=headers)
+            except httpx.HTTPError as e:
+                row["status"] = "failed"
+                row["error_message"] = f"{type(e).__name__}: {str(e)}"[:settings.WEBHOOK_RESPONSE_MAX_CHARS]
+                return row
+
+    row["response_status_code"] = response.status_code
+    if response.status_code < 400:
+        row["status"] = "delivered"
+        row["delivered_at"] = datetime.utcnow()
+    else:
+        row["status"] = "failed"
+        row["error_message"] = response.text[:settings.WEBHOOK_RESPONSE_MAX_CHARS]
+    return row
+
+def save_deliveries(rows: List[dict]):
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        db.execute(insert(WebhookDelivery), rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        metrics.record_backend_error("db", "webhook_deliveries")
+        api_logger.error(f"Failed to record {len(rows)} webhook deliveries: {str(e)}")
+    finally:
+        db.close()
+
+# Delivers a batch of messages and returns the ids that should be retried.
+async def deliver_messages(messages: List[Message]) -> Set[str]:
+    failed: Dict[str, None] = {}
+
+    events = []
+    for message_id, body, attempt in messages:
+        try:
+            events.append(parse_message(message_id, body, attempt))
+        except (KeyError, TypeError, ValueError) as e:
+            # Reported as failed so the bus dead-letters it after
+            # EVENT_MAX_DELIVERIES / maxReceiveCount instead of dropping it.
+            api_logger.error(f"Malformed webhook message {message_id}: {str(e)}")
+            failed[message_id] = None
+
+    grouped: Dict[Tuple[int, str], List[dict]] = defaultdict(list)
+    for webhook_event in events:
+        grouped[(webhook_event["api_id"], webhook_event["event_type"])].append(webhook_event)
+
+    try:
+        targets = await asyncio.to_thread(resolve_targets, {api_id for api_id, _ in grouped})
+    except Exception as e:
+        metrics.record_backend_error("db", "webhook_subscriptions")
+        api_logger.error(f"Failed to resolve webhook subscriptions: {str(e)}")
+        return {message_id for message_id, _, _ in messages}
+
+    jobs = [
+        (webhook_event, target)
+        for key, group in grouped.items()
+        for target in targets.get(key, ())
+        for webhook_event in group
+    ]
+
+    rows = []
+    if jobs:
+        semaphore = asyncio.Semaphore(settings.WEBHOOK_DELIVERY_CONCURRENCY)
+        async with httpx.AsyncClient(timeout=settings.WEBHOOK_DELIVERY_TIMEOUT_SECONDS) as client:
+            rows = await asyncio.gather(*(deliver(client, semaphore, webhook_event, target) for webhook_event, target in jobs))
+
+        for (webhook_event, _), row in zip(jobs, rows):
+            if row["status"] == "failed" and is_retryable(row["response_status_code"]):
+                failed[webhook_event["message_id"]] = None
+
+        await asyncio.to_thread(save_deliveries, rows)
+
+    delivered = sum(1 for row in rows if row["status"] == "delivered")
+    api_logger.info(
+        f"Processed webhook batch: messages={len(messages)}, deliveries={len(rows)}, "
+        f"delivered={delivered}, retrying={len(failed)}"
+    )
+    return set(failed)
+
+async def process_sqs_batch(event: dict) -> dict:
+    records = event.get("Records", [])
+    messages = []
+    failed = set()
+    for record in records:
+        try:
+            messages.append(sqs_message(record))
+        except (KeyError, TypeError, ValueError) as e:
+            api_logger.error(f"Malformed SQS record {record.get('messageId')}: {str(e)}")
+            if record.get("messageId"):
+                failed.add(record["messageId"])
+
+    failed |= await deliver_messages(messages)
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": record["messageId"]}
+            for record in records
+            if record.get("messageId") in failed
+        ]
+    }
+
+def handle_sqs_event(event: dict) -> dict:
+    # Reuse the loop Mangum runs HTTP events on, so a warm container keeps a
+    # single event loop across both kinds of invocation.
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+    return loop.run_until_complete(process_sqs_batch(event))
@@ -2,17 +2,19 @@ import json
 import hmac
 import hashlib
 import httpx
-import boto3
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
+from app.config import get_settings
 from app.models.webhook_subscription import WebhookSubscription
 from app.models.webhook_delivery import WebhookDelivery
 from app.models.api import API
 from app.models.user import User
-from app.utils.logger import api_logger
+from app.services.event_bus_service import event_bus
+from app.utils import metrics, tracing
+from app.utils.logger import api_logger, proxy_logger
 
-eventbridge_client = boto3.client('events')
+settings = get_settings()
 
 def create_subscription(
     db: Session,
@@ -120,21 +122,17 @@ def publish_event(
             'timestamp': datetime.utcnow().isoformat()
         }
         
-        response = eventbridge_client.put_events(
-            Entries=[
-                {
-                    'Source': 'apiverse.webhooks',
-                    'DetailType': event_type,
-                    'Detail': json.dumps(event_detail),
-                    'EventBusName': 'apiverse-events'
-                }
-            ]
-        )
+        with metrics.time_phase("event_publish", api_id):
+            trace_context = tracing.inject_context()
+            if trace_context:
+                event_detail['trace_context'] = trace_context
+
+            message_id = event_bus.publish(event_detail)
         
-        api_logger.info(f"Published event to EventBridge: {event_type}, api_id={api_id}")
-        return response
+        proxy_logger.info("Published event to %s: %s, api_id=%s", settings.EVENT_BUS_BACKEND, event_type, api_id)
+        return message_id
     except Exception as e:
-        api_logger.error(f"Failed to publish event: {str(e)}")
+        api_logger.error("Failed to publish event: %s", e)
         return None
 
 def generate_signature(payload: str, secret: str) -> str:
@@ -0,0 +1,110 @@
+import gzip
+from typing import Dict, Optional
+from app.config import get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+settings = get_settings()
+
+COMPRESSIBLE_TYPE_PREFIXES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-www-form-urlencoded",
+    "image/svg+xml",
+)
+COMPRESSIBLE_TYPE_SUFFIXES = ("+json", "+xml")
+
+def available_encodings() -> tuple:
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+SUPPORTED_ENCODINGS = available_encodings()
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    if not header:
+        return accepted
+
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+
+    return accepted
+
+def accepts(accepted: Dict[str, float], content_encoding: str) -> bool:
+    for encoding in content_encoding.lower().split(","):
+        encoding = encoding.strip()
+        if not encoding or encoding == "identity":
+            continue
+        if accepted.get(encoding, accepted.get("*", 0)) <= 0:
+            return False
+    return True
+
+def choose_encoding(accepted: Dict[str, float]) -> Optional[str]:
+    best = None
+    best_quality = 0.0
+
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(encoding, accepted.get("*", 0))
+        if quality > best_quality:
+            best = encoding
+            best_quality = quality
+
+    return best
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPE_PREFIXES) or media_type.endswith(COMPRESSIBLE_TYPE_SUFFIXES)
+
+# Compressing a range would leave Content-Range describing the wrong bytes.
+def is_partial(status_code: int, content_range: Optional[str]) -> bool:
+    return status_code == 206 or bool(content_range)
+
+def should_compress(content_type: Optional[str], body: bytes) -> bool:
+    return (
+        settings.PROXY_COMPRESSION_ENABLED
+        and len(body) >= settings.PROXY_COMPRESSION_MIN_BYTES
+        and is_compressible(content_type)
+    )
+
+# True whenever the body sent could depend on Accept-Encoding, including
+# responses that go out uncompressed because they were small or the client
+# did not accept an encoding, so shared caches key on it.
+def varies_on_accept_encoding(content_type: Optional[str], upstream_encoding: Optional[str]) -> bool:
+    return bool(upstream_encoding) or (settings.PROXY_COMPRESSION_ENABLED and is_compressible(content_type))
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.PROXY_ZSTD_LEVEL).compress(body)
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.PROXY_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.PROXY_GZIP_LEVEL, mtime=0)
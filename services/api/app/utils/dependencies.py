@@ -1,21 +1,79 @@
+import hashlib
+import time
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from app.core import database
 from app.core.database import get_db
 from app.models.user import User
 from app.config import get_settings
+from app.services.read_replica_service import read_replica_guard
+from app.utils import metrics
+from app.utils.cache import TTLCache
 from app.utils.logger import security_logger
 
 settings = get_settings()
 security = HTTPBearer()
 
+user_cache = TTLCache(maxsize=settings.AUTH_USER_CACHE_MAX_SIZE, ttl=settings.AUTH_USER_CACHE_TTL_SECONDS)
+token_cache = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_MAX_SIZE)
+
+def invalidate_user_cache(user_id: int):
+    user_cache.pop(user_id)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User):
+    invalidate_user_cache(target.id)
+
+def _decode_user_id(token: str) -> Optional[int]:
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    user_id = token_cache.get(digest)
+    metrics.record_cache("jwt_token", user_id is not None)
+    if user_id is not None:
+        return user_id
+
+    from jose import JWTError, jwt
+
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError as e:
+        raise ValueError(str(e))
+
+    sub = payload.get("sub")
+    if sub is None:
+        return None
+
+    user_id = int(sub)
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(digest, user_id, ttl=max(0, exp - time.time()))
+    return user_id
+
+def _load_user(db: Session, user_id: int) -> Optional[User]:
+    cached = user_cache.get(user_id)
+    metrics.record_cache("user", cached is not None)
+    if cached is not None:
+        return User(**cached)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        user_cache.set(user_id, {
+            "id": user.id,
+            "email": user.email,
+            "is_active": user.is_active,
+            "is_superuser": user.is_superuser
+        })
+    return user
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     token = credentials.credentials
-    
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -23,18 +81,17 @@ def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        user_id: str = payload.get("sub")
+        user_id = _decode_user_id(token)
 
         if user_id is None:
             security_logger.warning("JWT token missing 'sub' claim")
             raise credentials_exception
 
-    except JWTError as e:
+    except ValueError as e:
         security_logger.warning(f"JWT validation failed: {str(e)}")
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = _load_user(db, user_id)
 
     if user is None:
         security_logger.warning(f"User not found for user_id: {user_id}")
@@ -46,6 +103,29 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
         )
-    
-    security_logger.info(f"User authenticated successfully: user_id={user.id}, email={user.email}")
-    return user
\ No newline at end of file
+
+    db.info["user_id"] = user.id
+    security_logger.info("User authenticated successfully: user_id=%s, email=%s", user.id, user.email)
+    return user
+
+def get_current_superuser(current_user: User = Depends(get_current_user)) -> User:
+    if not current_user.is_superuser:
+        security_logger.warning(f"Non-admin attempted admin access: user_id={current_user.id}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required"
+        )
+    return current_user
+
+def get_read_db(current_user: User = Depends(get_current_user)):
+    database.init_read_db()
+
+    if database.ReadSessionLocal is database.SessionLocal or read_replica_guard.has_recent_write(current_user.id):
+        db = database.SessionLocal()
+    else:
+        db = database.ReadSessionLocal()
+
+    try:
+        yield db
+    finally:
+        db.close()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+from app.config import get_settings
+from app.utils import metrics
+from app.utils.logger import security_logger
+
+settings = get_settings()
+
+class HashingOverloadedError(Exception):
+    pass
+
+# Bounded pool for Argon2 work. argon2-cffi releases the GIL, so threads give
+# real parallelism; the process pool is for deployments that want hashing
+# fully isolated from the interpreter serving requests.
+class HashingExecutor:
+    def __init__(self):
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if settings.HASHING_EXECUTOR == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=settings.HASHING_MAX_WORKERS)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=settings.HASHING_MAX_WORKERS,
+                        thread_name_prefix="argon2"
+                    )
+            return self._executor
+
+    def _release(self, future: Optional[Future] = None):
+        with self._lock:
+            self._pending -= 1
+            metrics.record_hashing_pending(self._pending, settings.HASHING_MAX_WORKERS)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        executor = self._get_executor()
+
+        with self._lock:
+            if self._pending >= settings.HASHING_MAX_PENDING:
+                metrics.record_hashing_rejection()
+                security_logger.warning("Hashing queue full: %s operations pending", self._pending)
+                raise HashingOverloadedError("Too many password hashing operations in progress")
+            self._pending += 1
+            metrics.record_hashing_pending(self._pending, settings.HASHING_MAX_WORKERS)
+
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn: Callable, *args):
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable, *args):
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+hashing_executor = HashingExecutor()
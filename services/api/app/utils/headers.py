@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+HOP_BY_HOP_HEADERS = frozenset({
+    b"connection",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"proxy-connection",
+    b"te",
+    b"trailer",
+    b"transfer-encoding",
+    b"upgrade",
+})
+
+REQUEST_EXCLUDED_HEADERS = HOP_BY_HOP_HEADERS | {
+    b"host",
+    b"x-api-key",
+    b"content-length",
+    b"x-forwarded-for",
+    b"x-forwarded-proto",
+}
+
+RESPONSE_EXCLUDED_HEADERS = HOP_BY_HOP_HEADERS | {
+    b"content-length",
+    b"content-encoding",
+}
+
+RATE_LIMIT_HEADER_FIELDS = (
+    (b"x-ratelimit-limit-hour", "limit_hour"),
+    (b"x-ratelimit-remaining-hour", "remaining_hour"),
+    (b"x-ratelimit-reset-hour", "reset_hour"),
+    (b"x-ratelimit-limit-day", "limit_day"),
+    (b"x-ratelimit-remaining-day", "remaining_day"),
+    (b"x-ratelimit-reset-day", "reset_day"),
+)
+
+def _nominated_excluded(connection_values: List[bytes], base: frozenset) -> frozenset:
+    nominated = set()
+    for value in connection_values:
+        for token in value.split(b","):
+            token = token.strip().lower()
+            if token and token not in base:
+                nominated.add(token)
+    return base | nominated if nominated else base
+
+def build_upstream_headers(
+    raw_headers: Sequence[Tuple[bytes, bytes]],
+    client_host: Optional[str],
+    scheme: str
+) -> RawHeaders:
+    headers = []
+    connection_values = None
+    forwarded_for = None
+    forwarded_proto = None
+
+    for name, value in raw_headers:
+        if name not in REQUEST_EXCLUDED_HEADERS:
+            headers.append((name, value))
+        elif name == b"connection":
+            connection_values = [value] if connection_values is None else connection_values + [value]
+        elif name == b"x-forwarded-for":
+            forwarded_for = value if forwarded_for is None else forwarded_for + b", " + value
+        elif name == b"x-forwarded-proto" and forwarded_proto is None:
+            forwarded_proto = value
+
+    if connection_values:
+        excluded = _nominated_excluded(connection_values, REQUEST_EXCLUDED_HEADERS)
+        if excluded is not REQUEST_EXCLUDED_HEADERS:
+            headers = [(name, value) for name, value in headers if name not in excluded]
+
+    if client_host:
+        client = client_host.encode("latin-1")
+        if forwarded_for is None:
+            forwarded_for = client
+        elif forwarded_for.rsplit(b",", 1)[-1].strip() != client:
+            forwarded_for = forwarded_for + b", " + client
+
+    if forwarded_for is not None:
+        headers.append((b"x-forwarded-for", forwarded_for))
+    headers.append((b"x-forwarded-proto", forwarded_proto or scheme.encode("latin-1")))
+
+    return headers
+
+def set_header(headers: RawHeaders, name: str, value: str) -> RawHeaders:
+    key = name.lower().encode("latin-1")
+    headers[:] = [(k, v) for k, v in headers if k != key]
+    headers.append((key, value.encode("latin-1")))
+    return headers
+
+def filter_response_headers(raw_headers: Sequence[Tuple[bytes, bytes]]) -> RawHeaders:
+    headers = []
+    connection_values = None
+
+    for name, value in raw_headers:
+        name = name.lower()
+        if name not in RESPONSE_EXCLUDED_HEADERS:
+            headers.append((name, value))
+        elif name == b"connection":
+            connection_values = [value] if connection_values is None else connection_values + [value]
+
+    if connection_values:
+        excluded = _nominated_excluded(connection_values, RESPONSE_EXCLUDED_HEADERS)
+        if excluded is not RESPONSE_EXCLUDED_HEADERS:
+            headers = [(name, value) for name, value in headers if name not in excluded]
+
+    return headers
+
+def add_vary(headers: RawHeaders, field: bytes):
+    for index, (name, value) in enumerate(headers):
+        if name == b"vary":
+            if field.lower() not in value.lower():
+                headers[index] = (name, value + b", " + field)
+            return
+    headers.append((b"vary", field))
+
+def rate_limit_headers(rate_limit_info: dict) -> RawHeaders:
+    return [(name, b"%d" % rate_limit_info[key]) for name, key in RATE_LIMIT_HEADER_FIELDS]
+
+def rate_limit_header_dict(rate_limit_info: dict) -> Dict[str, str]:
+    return {name.decode("latin-1"): str(rate_limit_info[key]) for name, key in RATE_LIMIT_HEADER_FIELDS}
@@ -1,31 +1,104 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
 import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
+from app.config import get_settings
 
-def setup_logger(name: str, level: Optional[int] = None) -> logging.Logger:
+settings = get_settings()
+
+STANDARD_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({})).keys()) | {"message", "asctime", "taskName"}
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+class DeferredQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.INFO or random.random() < self.rate
+
+def _build_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT == "json":
+        return JsonFormatter()
+
+    return logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+_output_handler = logging.StreamHandler(sys.stdout)
+_output_handler.setFormatter(_build_formatter())
+_listener = None
+
+# Lambda freezes the container between invocations and may never run atexit,
+# so records still queued for the listener thread would be delayed or lost.
+def _use_queue() -> bool:
+    if settings.LOG_ASYNC is not None:
+        return settings.LOG_ASYNC
+    return not os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
+
+def _get_handler() -> logging.Handler:
+    global _listener
+
+    if not _use_queue():
+        return _output_handler
+
+    if _listener is None:
+        _listener = QueueListener(queue.SimpleQueue(), _output_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    return DeferredQueueHandler(_listener.queue)
+
+def _level_for(name: str) -> int:
+    return logging.getLevelName(settings.LOG_LEVELS.get(name, settings.LOG_LEVEL).upper())
+
+def setup_logger(name: str, level: Optional[int] = None, sample_rate: Optional[float] = None) -> logging.Logger:
     if level is None:
-        level = logging.INFO
-    
+        level = _level_for(name)
+
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     if logger.handlers:
         return logger
 
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setLevel(level)
+    logger.addHandler(_get_handler())
+
+    if sample_rate is not None and sample_rate < 1.0:
+        logger.addFilter(SamplingFilter(sample_rate))
 
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
-    logger.addHandler(handler)
-    
     return logger
 
 auth_logger = setup_logger("apiverse.auth")
 api_logger = setup_logger("apiverse.api")
 db_logger = setup_logger("apiverse.database")
 security_logger = setup_logger("apiverse.security")
+proxy_logger = setup_logger("apiverse.proxy", sample_rate=settings.LOG_PROXY_SAMPLE_RATE)
@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Set
+from app.config import get_settings
+from app.utils import tracing
+from app.utils.logger import api_logger
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:
+    prometheus_client = None
+
+settings = get_settings()
+
+PHASES = (
+    "key_verification",
+    "rate_limit",
+    "route_lookup",
+    "upstream",
+    "metering",
+    "event_publish",
+)
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+OVERFLOW_API_LABEL = "other"
+
+_api_labels: Set[str] = set()
+_api_labels_lock = threading.Lock()
+_last_push = 0.0
+
+def enabled() -> bool:
+    return prometheus_client is not None and settings.METRICS_ENABLED
+
+if prometheus_client is not None:
+    proxy_latency = Histogram(
+        "apiverse_proxy_request_duration_seconds",
+        "Total proxy request latency",
+        ["api_id"],
+        buckets=LATENCY_BUCKETS
+    )
+    phase_latency = Histogram(
+        "apiverse_proxy_phase_duration_seconds",
+        "Proxy request latency by phase",
+        ["api_id", "phase"],
+        buckets=LATENCY_BUCKETS
+    )
+    upstream_responses = Counter(
+        "apiverse_upstream_responses_total",
+        "Upstream responses by status class",
+        ["api_id", "status_class"]
+    )
+    cache_requests = Counter(
+        "apiverse_cache_requests_total",
+        "In-process cache lookups",
+        ["cache", "result"]
+    )
+    backend_errors = Counter(
+        "apiverse_backend_errors_total",
+        "Redis and database errors",
+        ["backend", "operation"]
+    )
+    hashing_operations = Gauge(
+        "apiverse_hashing_operations",
+        "Argon2 operations on the hashing executor",
+        ["state"],
+        multiprocess_mode="livesum"
+    )
+    hashing_rejections = Counter(
+        "apiverse_hashing_rejections_total",
+        "Argon2 operations rejected because the hashing queue was full"
+    )
+
+def api_label(api_id: Optional[int]) -> str:
+    if api_id is None:
+        return OVERFLOW_API_LABEL
+
+    label = str(api_id)
+    if label in _api_labels:
+        return label
+
+    with _api_labels_lock:
+        if len(_api_labels) >= settings.METRICS_MAX_API_LABELS:
+            return OVERFLOW_API_LABEL
+        _api_labels.add(label)
+    return label
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+def observe_request(api_id: Optional[int], seconds: float):
+    if enabled():
+        proxy_latency.labels(api_label(api_id)).observe(seconds)
+
+def observe_phase(phase: str, api_id: Optional[int], seconds: float):
+    if enabled():
+        phase_latency.labels(api_label(api_id), phase).observe(seconds)
+
+@contextmanager
+def time_phase(phase: str, api_id: Optional[int]):
+    started = time.perf_counter()
+    try:
+        with tracing.span(f"proxy.{phase}", {"apiverse.api_id": api_label(api_id)}):
+            yield
+    finally:
+        observe_phase(phase, api_id, time.perf_counter() - started)
+
+def record_upstream_response(api_id: Optional[int], status: str):
+    if enabled():
+        upstream_responses.labels(api_label(api_id), status).inc()
+
+def record_cache(cache: str, hit: bool):
+    if enabled():
+        cache_requests.labels(cache, "hit" if hit else "miss").inc()
+
+def record_backend_error(backend: str, operation: str):
+    if enabled():
+        backend_errors.labels(backend, operation).inc()
+
+def record_hashing_pending(pending: int, workers: int):
+    if enabled():
+        running = min(pending, workers)
+        hashing_operations.labels("running").set(running)
+        hashing_operations.labels("queued").set(pending - running)
+
+def record_hashing_rejection():
+    if enabled():
+        hashing_rejections.inc()
+
+def render_latest() -> tuple:
+    # Multi-worker servers share metric values through PROMETHEUS_MULTIPROC_DIR
+    # (see app/server.py); collect from there so any worker reports them all.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+    return prometheus_client.generate_latest(), prometheus_client.CONTENT_TYPE_LATEST
+
+def push_if_due():
+    global _last_push
+
+    if not enabled() or not settings.METRICS_PUSHGATEWAY_URL:
+        return
+
+    now = time.monotonic()
+    if now - _last_push < settings.METRICS_PUSH_INTERVAL_SECONDS:
+        return
+    _last_push = now
+
+    grouping_key = {"instance": os.environ.get("AWS_LAMBDA_LOG_STREAM_NAME", str(os.getpid()))}
+    try:
+        prometheus_client.pushadd_to_gateway(
+            settings.METRICS_PUSHGATEWAY_URL,
+            job=settings.METRICS_PUSH_JOB,
+            registry=prometheus_client.REGISTRY,
+            grouping_key=grouping_key
+        )
+    except Exception as e:
+        api_logger.error(f"Failed to push metrics: {str(e)}")
@@ -1,24 +1,81 @@
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from typing import Optional, Tuple
 from app.config import get_settings
+from app.utils.hashing import hashing_executor
 
 settings = get_settings()
-ph = PasswordHasher()
 
-def hash_password(password: str) -> str:
-    return ph.hash(password)
+PASSWORD = "password"
+API_KEY = "api_key"
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+_password_hasher = None
+_api_key_hasher = None
+
+def _build_hasher(time_cost: int, memory_cost: int, parallelism: int):
+    from argon2 import PasswordHasher
+
+    return PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+
+def get_password_hasher():
+    global _password_hasher
+    if _password_hasher is None:
+        _password_hasher = _build_hasher(
+            settings.ARGON2_TIME_COST,
+            settings.ARGON2_MEMORY_COST_KIB,
+            settings.ARGON2_PARALLELISM
+        )
+    return _password_hasher
+
+def get_api_key_hasher():
+    global _api_key_hasher
+    if _api_key_hasher is None:
+        _api_key_hasher = _build_hasher(
+            settings.API_KEY_ARGON2_TIME_COST,
+            settings.API_KEY_ARGON2_MEMORY_COST_KIB,
+            settings.API_KEY_ARGON2_PARALLELISM
+        )
+    return _api_key_hasher
+
+def _get_hasher(purpose: str):
+    return get_api_key_hasher() if purpose == API_KEY else get_password_hasher()
+
+# Module-level so they can be pickled into a process pool; each worker
+# builds its own hashers from the same settings.
+def _hash(purpose: str, plain: str) -> str:
+    return _get_hasher(purpose).hash(plain)
+
+def _verify_and_rehash(purpose: str, hashed: str, plain: str) -> Tuple[bool, Optional[str]]:
+    from argon2.exceptions import VerifyMismatchError
+
+    hasher = _get_hasher(purpose)
     try:
-        ph.verify(hashed_password, plain_password)
-        return True
+        hasher.verify(hashed, plain)
     except VerifyMismatchError:
-        return False
+        return False, None
+
+    if hasher.check_needs_rehash(hashed):
+        return True, hasher.hash(plain)
+    return True, None
+
+def hash_password(password: str) -> str:
+    return hashing_executor.run(_hash, PASSWORD, password)
+
+def hash_api_key(api_key: str) -> str:
+    return hashing_executor.run(_hash, API_KEY, api_key)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    verified, _ = verify_password_and_rehash(plain_password, hashed_password)
+    return verified
+
+def verify_password_and_rehash(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return hashing_executor.run(_verify_and_rehash, PASSWORD, hashed_password, plain_password)
+
+async def verify_api_key_and_rehash(api_key: str, key_hash: str) -> Tuple[bool, Optional[str]]:
+    return await hashing_executor.run_async(_verify_and_rehash, API_KEY, key_hash, api_key)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
     
     if expires_delta:
@@ -0,0 +1,144 @@
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+from app.config import get_settings
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+# OpenTelemetry is imported on first use only, so the cold-start path pays
+# nothing when tracing is disabled.
+_tracer = None
+_provider = None
+_sqlalchemy_instrumented = False
+
+def enabled() -> bool:
+    return _tracer is not None
+
+def setup_tracing(app):
+    global _tracer, _provider
+
+    if not settings.TRACING_ENABLED or _tracer is not None:
+        return
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from opentelemetry.instrumentation.redis import RedisInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as e:
+        api_logger.error(f"Tracing enabled but OpenTelemetry is not installed: {str(e)}")
+        return
+
+    _provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": settings.TRACING_SERVICE_NAME,
+            "service.version": settings.VERSION,
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+    )
+    _provider.add_span_processor(
+        BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT))
+    )
+    trace.set_tracer_provider(_provider)
+
+    FastAPIInstrumentor.instrument_app(
+        app,
+        tracer_provider=_provider,
+        excluded_urls=settings.TRACING_EXCLUDED_URLS
+    )
+    HTTPXClientInstrumentor().instrument(tracer_provider=_provider)
+    RedisInstrumentor().instrument(tracer_provider=_provider)
+
+    _tracer = trace.get_tracer("apiverse")
+    api_logger.info(f"Tracing enabled, exporting to {settings.TRACING_OTLP_ENDPOINT}")
+
+def instrument_engine(engine):
+    global _sqlalchemy_instrumented
+
+    if not settings.TRACING_ENABLED or engine is None:
+        return
+
+    try:
+        from opentelemetry import metrics, trace
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+        from opentelemetry.instrumentation.sqlalchemy.engine import EngineTracer
+        from opentelemetry.semconv.metrics import MetricInstruments
+    except ImportError:
+        return
+
+    if not _sqlalchemy_instrumented:
+        SQLAlchemyInstrumentor().instrument(engine=engine, enable_commenter=False)
+        _sqlalchemy_instrumented = True
+        return
+
+    # The instrumentor is a singleton and ignores further instrument() calls,
+    # so engines created later (the read replica) get their own EngineTracer.
+    name = SQLAlchemyInstrumentor.__module__
+    EngineTracer(
+        trace.get_tracer(name),
+        engine,
+        metrics.get_meter(name).create_up_down_counter(
+            name=MetricInstruments.DB_CLIENT_CONNECTIONS_USAGE,
+            unit="connections"
+        ),
+        False
+    )
+
+def span(name: str, attributes: Optional[dict] = None):
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+def inject_context() -> Dict[str, str]:
+    carrier: Dict[str, str] = {}
+    if _tracer is None:
+        return carrier
+
+    from opentelemetry.propagate import inject
+
+    inject(carrier)
+    return carrier
+
+@contextmanager
+def extracted_context(carrier: Optional[Dict[str, str]]):
+    if _tracer is None or not carrier:
+        yield
+        return
+
+    from opentelemetry import context
+    from opentelemetry.propagate import extract
+
+    token = context.attach(extract(carrier))
+    try:
+        yield
+    finally:
+        context.detach(token)
+
+# Lambda freezes the container between invocations, so spans left in the
+# batch processor would only be exported on a later invocation, if ever.
+def force_flush():
+    if _provider is None:
+        return
+
+    try:
+        _provider.force_flush(timeout_millis=settings.TRACING_FLUSH_TIMEOUT_MS)
+    except Exception as e:
+        api_logger.error(f"Failed to flush traces: {str(e)}")
+
+def shutdown():
+    global _tracer, _provider
+
+    if _provider is None:
+        return
+
+    try:
+        _provider.shutdown()
+    except Exception as e:
+        api_logger.error(f"Failed to flush traces on shutdown: {str(e)}")
+    _tracer = None
+    _provider = None
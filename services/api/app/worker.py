@@ -0,0 +1,34 @@
+import asyncio
+import signal
+from app.config import get_settings
+from app.services import webhook_consumer_service
+from app.services.event_bus_service import event_bus
+from app.services.redis_service import redis_service
+from app.utils.logger import api_logger
+
+settings = get_settings()
+
+# Standalone webhook delivery worker: `python -m app.worker`. With the Redis
+# Streams backend any number of these can run next to (or instead of) the
+# workers inside API servers, all in the same consumer group.
+
+async def run():
+    if not event_bus.has_worker:
+        api_logger.error(f"EVENT_BUS_BACKEND={settings.EVENT_BUS_BACKEND} is delivered by the SQS handler, not a worker")
+        return
+
+    worker = asyncio.create_task(event_bus.run_worker(webhook_consumer_service.deliver_messages))
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.cancel)
+
+    try:
+        await worker
+    except asyncio.CancelledError:
+        api_logger.info("Webhook event worker stopped")
+    finally:
+        await redis_service.aclose()
+        redis_service.close()
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REQUIRED_ENV = {
+    "REDIS_HOST": "localhost",
+    "JWT_SECRET_KEY": "analytics-benchmark",
+}
+
+WINDOW_UNITS = {"h": timedelta(hours=1), "d": timedelta(days=1)}
+
+ANALYTICS_FUNCTIONS = ("get_usage_stats", "get_endpoint_stats", "get_error_stats", "get_performance_stats")
+
+def parse_windows(value: str) -> List[str]:
+    windows = [item for item in value.split(",") if item]
+    for window in windows:
+        if window[-1] not in WINDOW_UNITS or not window[:-1].isdigit():
+            raise argparse.ArgumentTypeError(f"invalid window {window!r}, expected e.g. 1h or 7d")
+    return windows
+
+def window_delta(window: str) -> timedelta:
+    return int(window[:-1]) * WINDOW_UNITS[window[-1]]
+
+def select_apis(db, user_id: int) -> Dict[str, int]:
+    from sqlalchemy import func
+    from app.models.api import API
+    from app.models.usage_metric import UsageMetric
+
+    volumes = (
+        db.query(UsageMetric.api_id, func.count(UsageMetric.id).label("rows"))
+        .join(API, API.id == UsageMetric.api_id)
+        .filter(API.user_id == user_id)
+        .group_by(UsageMetric.api_id)
+        .order_by(func.count(UsageMetric.id).desc())
+        .all()
+    )
+    if not volumes:
+        return {}
+
+    return {
+        "hot": volumes[0].api_id,
+        "median": volumes[len(volumes) // 2].api_id,
+        "cold": volumes[-1].api_id,
+    }
+
+def explain(db, function_name: str, api_id: int, user_id: int, start_date, end_date) -> List[str]:
+    from sqlalchemy import event
+    from app.services import analytics_service
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "usage_metrics" in statement:
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        getattr(analytics_service, function_name)(db=db, api_id=api_id, user_id=user_id, start_date=start_date, end_date=end_date)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plans = []
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for statement, parameters in statements:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plans.append("\n".join(row[0] for row in cursor.fetchall()))
+        raw.rollback()
+    finally:
+        raw.close()
+    return plans
+
+def run(args) -> dict:
+    from sqlalchemy import func
+    from app.core import database
+    from app.models.usage_metric import UsageMetric
+    from app.models.user import User
+    from app.services import analytics_service
+    from benchmarks.usage_data import SYNTHETIC_USER_EMAIL
+
+    database.init_db()
+    db = database.SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == SYNTHETIC_USER_EMAIL).first()
+        if user is None:
+            sys.exit("No synthetic data found; run `python -m benchmarks.usage_data` first")
+
+        apis = {label: api_id for label, api_id in select_apis(db, user.id).items() if label in args.apis}
+        if not apis:
+            sys.exit("No synthetic usage_metrics rows found; run `python -m benchmarks.usage_data` first")
+
+        dialect = database.engine.dialect.name
+        results = []
+
+        for label, api_id in apis.items():
+            end_date = db.query(func.max(UsageMetric.timestamp)).filter(UsageMetric.api_id == api_id).scalar()
+
+            for window in args.windows:
+                start_date = end_date - window_delta(window)
+                rows_in_window = db.query(func.count(UsageMetric.id)).filter(
+                    UsageMetric.api_id == api_id,
+                    UsageMetric.timestamp >= start_date,
+                    UsageMetric.timestamp <= end_date
+                ).scalar()
+
+                for function_name in args.functions:
+                    function = getattr(analytics_service, function_name)
+                    call = lambda: function(db=db, api_id=api_id, user_id=user.id, start_date=start_date, end_date=end_date)
+
+                    for _ in range(args.warmup):
+                        call()
+                    samples = []
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        call()
+                        samples.append((time.perf_counter() - started) * 1000)
+
+                    result = {
+                        "function": function_name,
+                        "api": label,
+                        "api_id": api_id,
+                        "window": window,
+                        "rows_in_window": rows_in_window,
+                        "median_ms": statistics.median(samples),
+                        "min_ms": min(samples),
+                        "max_ms": max(samples),
+                        "samples_ms": samples,
+                    }
+                    if args.explain and dialect == "postgresql":
+                        result["plans"] = explain(db, function_name, api_id, user.id, start_date, end_date)
+
+                    print(f"{function_name:<24} {label:<7} {window:>5} {rows_in_window:>12} rows  "
+                          f"median {result['median_ms']:10.2f} ms  min {result['min_ms']:10.2f} ms")
+                    for plan in result.get("plans", []):
+                        print(plan)
+                    results.append(result)
+
+        total_rows = db.query(func.count(UsageMetric.id)).scalar()
+    finally:
+        db.close()
+
+    return {
+        "metadata": {
+            "database": dialect,
+            "usage_metrics_rows": total_rows,
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time analytics_service queries over synthetic usage_metrics")
+    parser.add_argument("--windows", type=parse_windows, default=["1h", "1d", "7d", "30d"],
+                        help="Comma-separated windows ending at the newest row, e.g. 1h,1d,7d,30d")
+    parser.add_argument("--apis", default="hot,median,cold",
+                        help="Comma-separated subset of hot,median,cold (APIs by row count)")
+    parser.add_argument("--functions", default=",".join(ANALYTICS_FUNCTIONS),
+                        help=f"Comma-separated subset of: {', '.join(ANALYTICS_FUNCTIONS)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--explain", action="store_true", help="Include EXPLAIN (ANALYZE, BUFFERS) plans (PostgreSQL only)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    args.apis = [item for item in args.apis.split(",") if item]
+    args.functions = [item for item in args.functions.split(",") if item]
+    unknown = set(args.functions) - set(ANALYTICS_FUNCTIONS)
+    if unknown:
+        parser.error(f"unknown functions: {', '.join(sorted(unknown))}")
+
+    for key, value in REQUIRED_ENV.items():
+        os.environ.setdefault(key, value)
+    if SERVICE_ROOT not in sys.path:
+        sys.path.insert(0, SERVICE_ROOT)
+
+    results = run(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REQUIRED_ENV = {
+    "REDIS_HOST": "localhost",
+    "JWT_SECRET_KEY": "auth-benchmark",
+}
+
+# (time_cost, memory_cost KiB, parallelism) swept by --sweep: the argon2-cffi
+# defaults followed by the OWASP Password Storage Cheat Sheet configurations.
+SWEEP_PARAMETERS: List[Tuple[int, int, int]] = [
+    (3, 65536, 4),
+    (1, 47104, 1),
+    (2, 19456, 1),
+    (3, 12288, 1),
+    (4, 9216, 1),
+    (5, 7168, 1),
+]
+
+PASSWORD = "correct horse battery staple"
+
+def measure(fn: Callable, iterations: int, repeat: int) -> dict:
+    fn()
+    samples = [seconds / iterations for seconds in timeit.repeat(fn, number=iterations, repeat=repeat)]
+    return {
+        "ms_per_op": min(samples) * 1000,
+        "max_ms_per_op": max(samples) * 1000,
+        "iterations": iterations,
+        "repeat": repeat,
+    }
+
+def argon2_benchmarks(time_cost: int, memory_cost: int, parallelism: int, iterations: int, repeat: int) -> Dict[str, dict]:
+    from argon2 import PasswordHasher
+    from app.services import api_key_service
+
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hashed = hasher.hash(PASSWORD)
+    full_key, _, _ = api_key_service.generate_api_key("live")
+    key_hash = hasher.hash(full_key)
+
+    return {
+        "argon2_hash": measure(lambda: hasher.hash(PASSWORD), iterations, repeat),
+        "argon2_verify": measure(lambda: hasher.verify(hashed, PASSWORD), iterations, repeat),
+        "argon2_verify_api_key": measure(lambda: hasher.verify(key_hash, full_key), iterations, repeat),
+        "argon2_check_needs_rehash": measure(lambda: hasher.check_needs_rehash(hashed), iterations * 1000, repeat),
+    }
+
+def app_benchmarks(argon2_iterations: int, jwt_iterations: int, repeat: int) -> Dict[str, dict]:
+    import secrets
+    from jose import jwt
+    from app.config import get_settings
+    from app.services import api_key_service
+    from app.utils import dependencies
+    from app.utils.security import create_access_token
+
+    settings = get_settings()
+    token = create_access_token({"sub": "1"})
+
+    def decode_uncached():
+        dependencies.token_cache.clear()
+        dependencies._decode_user_id(token)
+
+    return {
+        "jwt_create_access_token": measure(lambda: create_access_token({"sub": "1"}), jwt_iterations, repeat),
+        "jwt_decode": measure(
+            lambda: jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]),
+            jwt_iterations,
+            repeat
+        ),
+        "jwt_decode_user_id_uncached": measure(decode_uncached, jwt_iterations, repeat),
+        "jwt_decode_user_id_cached": measure(lambda: dependencies._decode_user_id(token), jwt_iterations, repeat),
+        "api_key_random_part": measure(lambda: secrets.token_urlsafe(32), jwt_iterations, repeat),
+        "api_key_generate": measure(lambda: api_key_service.generate_api_key("live"), argon2_iterations, repeat),
+    }
+
+def print_results(title: str, results: Dict[str, dict]):
+    print(title)
+    for name, result in results.items():
+        print(f"  {name:<30} {result['ms_per_op']:10.3f} ms/op  (worst repeat {result['max_ms_per_op']:.3f} ms)")
+
+def parameters_label(time_cost: int, memory_cost: int, parallelism: int) -> str:
+    return f"t={time_cost},m={memory_cost},p={parallelism}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of Argon2 hashing, JWT handling and API key generation")
+    parser.add_argument("--time-cost", type=int, help="Defaults to ARGON2_TIME_COST")
+    parser.add_argument("--memory-cost", type=int, help="KiB, defaults to ARGON2_MEMORY_COST_KIB")
+    parser.add_argument("--parallelism", type=int, help="Defaults to ARGON2_PARALLELISM")
+    parser.add_argument("--sweep", action="store_true", help="Also measure the recommended Argon2 parameter sets")
+    parser.add_argument("--argon2-iterations", type=int, default=5)
+    parser.add_argument("--jwt-iterations", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget-ms", type=float, help="Flag Argon2 parameter sets whose verify exceeds this")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    for key, value in REQUIRED_ENV.items():
+        os.environ.setdefault(key, value)
+    if SERVICE_ROOT not in sys.path:
+        sys.path.insert(0, SERVICE_ROOT)
+
+    from app.config import get_settings
+
+    settings = get_settings()
+    configured = (
+        args.time_cost or settings.ARGON2_TIME_COST,
+        args.memory_cost or settings.ARGON2_MEMORY_COST_KIB,
+        args.parallelism or settings.ARGON2_PARALLELISM,
+    )
+
+    parameter_sets = [configured]
+    if args.sweep:
+        parameter_sets += [parameters for parameters in SWEEP_PARAMETERS if parameters != configured]
+
+    results = {"app": app_benchmarks(args.argon2_iterations, args.jwt_iterations, args.repeat), "argon2": {}}
+    print_results("JWT and API keys (configured settings):", results["app"])
+
+    over_budget: List[str] = []
+    for parameters in parameter_sets:
+        label = parameters_label(*parameters)
+        argon2_results = argon2_benchmarks(*parameters, args.argon2_iterations, args.repeat)
+        results["argon2"][label] = argon2_results
+        print_results(f"Argon2 {label}{' (configured)' if parameters == configured else ''}:", argon2_results)
+
+        if args.budget_ms is not None and argon2_results["argon2_verify"]["ms_per_op"] > args.budget_ms:
+            over_budget.append(label)
+
+    if args.budget_ms is not None:
+        print(f"\nOver the {args.budget_ms:.0f} ms verify budget: {', '.join(over_budget) or 'none'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import json
+import timeit
+import tracemalloc
+import httpx
+from app.utils.headers import build_upstream_headers, filter_response_headers, rate_limit_headers
+
+REQUEST_HEADERS = [
+    (b"host", b"abc123.execute-api.eu-west-1.amazonaws.com"),
+    (b"user-agent", b"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36"),
+    (b"accept", b"application/json"),
+    (b"accept-encoding", b"gzip, deflate, br"),
+    (b"accept-language", b"en-GB,en;q=0.9"),
+    (b"content-type", b"application/json"),
+    (b"content-length", b"128"),
+    (b"x-api-key", b"apv_live_0123456789abcdefghijklmnopqrstuvwxyzABCDEFG"),
+    (b"x-amzn-trace-id", b"Root=1-67891233-abcdef012345678912345678"),
+    (b"x-forwarded-for", b"203.0.113.10"),
+    (b"x-forwarded-port", b"443"),
+    (b"x-forwarded-proto", b"https"),
+    (b"connection", b"keep-alive"),
+]
+
+RESPONSE_HEADERS = [
+    (b"Date", b"Mon, 19 Oct 2026 10:00:00 GMT"),
+    (b"Content-Type", b"application/json; charset=utf-8"),
+    (b"Content-Length", b"4096"),
+    (b"Connection", b"keep-alive"),
+    (b"Cache-Control", b"no-cache"),
+    (b"ETag", b"\"33a64df551425fcc55e4d42a148795d9f25f89d4\""),
+    (b"Server", b"nginx"),
+    (b"Vary", b"Origin"),
+]
+
+RATE_LIMIT_INFO = {
+    "limit_hour": 1000,
+    "remaining_hour": 874,
+    "reset_hour": 1792404000,
+    "limit_day": 10000,
+    "remaining_day": 9512,
+    "reset_day": 1792454400,
+}
+
+# Mirrors proxy_request before app.utils.headers, including the str<->bytes
+# passes httpx and Starlette apply to dict headers.
+def legacy_request_headers():
+    headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in REQUEST_HEADERS}
+    headers.pop("host", None)
+    headers.pop("x-api-key", None)
+    return headers
+
+def legacy_response_headers():
+    excluded_headers = {
+        "content-length",
+        "content-encoding",
+        "transfer-encoding",
+        "connection"
+    }
+    response_headers = {
+        k.decode("latin-1"): v.decode("latin-1") for k, v in RESPONSE_HEADERS
+        if k.decode("latin-1").lower() not in excluded_headers
+    }
+    response_headers["X-RateLimit-Limit-Hour"] = str(RATE_LIMIT_INFO["limit_hour"])
+    response_headers["X-RateLimit-Remaining-Hour"] = str(RATE_LIMIT_INFO["remaining_hour"])
+    response_headers["X-RateLimit-Reset-Hour"] = str(RATE_LIMIT_INFO["reset_hour"])
+    response_headers["X-RateLimit-Limit-Day"] = str(RATE_LIMIT_INFO["limit_day"])
+    response_headers["X-RateLimit-Remaining-Day"] = str(RATE_LIMIT_INFO["remaining_day"])
+    response_headers["X-RateLimit-Reset-Day"] = str(RATE_LIMIT_INFO["reset_day"])
+    return response_headers
+
+def legacy():
+    httpx.Headers(legacy_request_headers())
+    [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in legacy_response_headers().items()]
+
+def current():
+    httpx.Headers(build_upstream_headers(REQUEST_HEADERS, "203.0.113.10", "https"))
+    headers = filter_response_headers(RESPONSE_HEADERS)
+    headers.extend(rate_limit_headers(RATE_LIMIT_INFO))
+
+def measure_allocations(fn, iterations: int) -> float:
+    fn()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    total = 0
+    for _ in range(iterations):
+        snapshot_before = tracemalloc.get_traced_memory()[0]
+        fn()
+        total += tracemalloc.get_traced_memory()[1] - snapshot_before
+        tracemalloc.reset_peak()
+    tracemalloc.stop()
+    return total / iterations
+
+def run(iterations: int) -> dict:
+    results = {}
+    for name, fn in (("legacy", legacy), ("current", current)):
+        seconds = min(timeit.repeat(fn, number=iterations, repeat=5))
+        results[name] = {
+            "ns_per_request": seconds / iterations * 1e9,
+            "peak_bytes_per_request": measure_allocations(fn, min(iterations, 10000)),
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request header processing cost in the proxy")
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+
+    for name, result in results.items():
+        print(f"{name:>8}: {result['ns_per_request']:8.0f} ns/request, {result['peak_bytes_per_request']:8.0f} peak bytes/request")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+# In-memory stand-ins for the backing services the proxy path talks to, so
+# the benchmarks run without Redis or AWS. They cover only the subset of each
+# API that the app uses and are not general-purpose fakes.
+
+# Values are returned as str, matching decode_responses=True.
+
+class FakeRedisStore:
+    def __init__(self):
+        self.data: Dict[str, object] = {}
+        self.expires_at: Dict[str, float] = {}
+        self.lock = threading.RLock()
+
+    def live(self, key: str) -> bool:
+        deadline = self.expires_at.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires_at.pop(key, None)
+        return key in self.data
+
+class FakeRedisCommands:
+    def __init__(self, store: FakeRedisStore):
+        self._store = store
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, key: str) -> Optional[str]:
+        with self._store.lock:
+            return self._store.data[key] if self._store.live(key) else None
+
+    def mget(self, keys, *args):
+        keys = [keys, *args] if isinstance(keys, str) else [*keys, *args]
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value, ex=None, px=None, nx: bool = False):
+        with self._store.lock:
+            if nx and self._store.live(key):
+                return None
+            self._store.data[key] = str(value)
+            self._store.expires_at.pop(key, None)
+            if ex is not None:
+                self._store.expires_at[key] = time.monotonic() + ex
+            elif px is not None:
+                self._store.expires_at[key] = time.monotonic() + px / 1000
+            return True
+
+    def incrby(self, key: str, amount: int = 1) -> int:
+        with self._store.lock:
+            value = int(self._store.data[key]) + amount if self._store.live(key) else amount
+            self._store.data[key] = str(value)
+            return value
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self.incrby(key, amount)
+
+    def decrby(self, key: str, amount: int = 1) -> int:
+        return self.incrby(key, -amount)
+
+    def expire(self, key: str, seconds) -> bool:
+        with self._store.lock:
+            if not self._store.live(key):
+                return False
+            self._store.expires_at[key] = time.monotonic() + seconds
+            return True
+
+    def exists(self, *keys) -> int:
+        with self._store.lock:
+            return sum(1 for key in keys if self._store.live(key))
+
+    def delete(self, *keys) -> int:
+        with self._store.lock:
+            deleted = 0
+            for key in keys:
+                if self._store.live(key):
+                    deleted += 1
+                self._store.data.pop(key, None)
+                self._store.expires_at.pop(key, None)
+            return deleted
+
+    def rename(self, src: str, dst: str) -> bool:
+        with self._store.lock:
+            if not self._store.live(src):
+                raise KeyError(src)
+            self._store.data[dst] = self._store.data.pop(src)
+            self._store.expires_at.pop(dst, None)
+            if src in self._store.expires_at:
+                self._store.expires_at[dst] = self._store.expires_at.pop(src)
+            return True
+
+    # Only the scripts the app sends are supported, each mirrored in Python.
+    def eval(self, script: str, numkeys: int, *keys_and_args):
+        from app.services.quota_lease_service import RELEASE_SCRIPT
+
+        if script != RELEASE_SCRIPT:
+            raise NotImplementedError("Unsupported Lua script")
+
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        with self._store.lock:
+            for key in keys:
+                if self._store.live(key):
+                    self.decrby(key, int(args[0]))
+        return 0
+
+    def hset(self, key: str, field, value) -> int:
+        with self._store.lock:
+            if not self._store.live(key):
+                self._store.data[key] = {}
+            is_new = str(field) not in self._store.data[key]
+            self._store.data[key][str(field)] = str(value)
+            return int(is_new)
+
+    def hgetall(self, key: str) -> dict:
+        with self._store.lock:
+            return dict(self._store.data[key]) if self._store.live(key) else {}
+
+    def hincrby(self, key: str, field, amount: int = 1) -> int:
+        with self._store.lock:
+            if not self._store.live(key):
+                self._store.data[key] = {}
+            value = int(self._store.data[key].get(str(field), 0)) + amount
+            self._store.data[key][str(field)] = str(value)
+            return value
+
+class FakePipeline:
+    def __init__(self, commands: FakeRedisCommands):
+        self._commands = commands
+        self._queued = []
+
+    def __getattr__(self, name: str):
+        command = getattr(self._commands, name)
+
+        def queue(*args, **kwargs):
+            self._queued.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list:
+        with self._commands._store.lock:
+            results = [command(*args, **kwargs) for command, args, kwargs in self._queued]
+        self._queued = []
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._queued = []
+
+class FakeRedis(FakeRedisCommands):
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def close(self):
+        pass
+
+class FakeAsyncPipeline(FakePipeline):
+    async def execute(self) -> list:
+        return FakePipeline.execute(self)
+
+class FakeAsyncRedis:
+    def __init__(self, store: FakeRedisStore):
+        self._commands = FakeRedisCommands(store)
+
+    def __getattr__(self, name: str):
+        command = getattr(self._commands, name)
+
+        async def call(*args, **kwargs):
+            return command(*args, **kwargs)
+
+        return call
+
+    def pipeline(self, transaction: bool = True) -> FakeAsyncPipeline:
+        return FakeAsyncPipeline(self._commands)
+
+    async def aclose(self):
+        pass
+
+class StubEventBridge:
+    def __init__(self):
+        self.published = 0
+
+    def put_events(self, Entries: list) -> dict:
+        self.published += len(Entries)
+        return {
+            "FailedEntryCount": 0,
+            "Entries": [{"EventId": str(uuid.uuid4())} for _ in Entries],
+        }
+
+def install_redis(redis_service) -> FakeRedisStore:
+    store = FakeRedisStore()
+    sync_client = FakeRedis(store)
+    async_client = FakeAsyncRedis(store)
+
+    redis_service.get_client = lambda: sync_client
+    redis_service.get_async_client = lambda: async_client
+    return store
+
+def install_eventbridge(event_bus_service) -> StubEventBridge:
+    client = StubEventBridge()
+    event_bus_service.get_eventbridge_client = lambda: client
+    return client
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget for `import app.main`, measured as the median of several
+# fresh interpreters. See docs/ARCHITECTURE.md ("Cold Start Budget").
+IMPORT_BUDGET_MS = 1600
+
+# Modules that must only be imported on first use, never at startup.
+DEFERRED_MODULES = ("boto3", "botocore", "jose", "argon2")
+
+REQUIRED_ENV = {
+    "REDIS_HOST": "localhost",
+    "JWT_SECRET_KEY": "import-time-report",
+}
+
+def measure_once(module: str) -> Dict[str, dict]:
+    env = {**REQUIRED_ENV, **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVICE_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules[name.strip()] = {
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        }
+    return modules
+
+def run(module: str, runs: int) -> dict:
+    samples: List[Dict[str, dict]] = [measure_once(module) for _ in range(runs)]
+    totals = [sample[module]["cumulative_ms"] for sample in samples]
+    median_run = samples[totals.index(sorted(totals)[len(totals) // 2])]
+
+    return {
+        "module": module,
+        "runs": runs,
+        "total_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "max_ms": max(totals),
+        "deferred_imported": sorted({
+            name for name in median_run
+            if name.split(".", 1)[0] in DEFERRED_MODULES
+        }),
+        "modules": median_run,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time report for the Lambda cold-start path")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--check", action="store_true", help="Exit non-zero when the budget is exceeded")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.module, args.runs)
+
+    print(f"{args.module}: {results['total_ms']:.0f} ms median over {args.runs} runs "
+          f"(min {results['min_ms']:.0f} ms, max {results['max_ms']:.0f} ms, budget {args.budget_ms:.0f} ms)")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    top_level = sorted(
+        ((name, stats) for name, stats in results["modules"].items() if stats["depth"] <= 1),
+        key=lambda item: item[1]["cumulative_ms"],
+        reverse=True
+    )
+    for name, stats in top_level[:args.top]:
+        print(f"{stats['cumulative_ms']:14.1f} {stats['self_ms']:9.1f}  {name}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if results["total_ms"] > args.budget_ms:
+        failures.append(f"import time {results['total_ms']:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+    if results["deferred_imported"]:
+        failures.append(f"deferred modules imported at startup: {', '.join(results['deferred_imported'])}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+
+    if args.check and failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Applied with setdefault before the app is imported, so anything already in
+# the environment (e.g. DATABASE_URL for a local Postgres) wins.
+BENCHMARK_ENV = {
+    "REDIS_HOST": "localhost",
+    "JWT_SECRET_KEY": "proxy-benchmark",
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "LOG_LEVEL": "ERROR",
+    "METRICS_PUSHGATEWAY_URL": "",
+}
+
+SCENARIOS = ("baseline", "cache-hit", "cache-miss", "rate-limited")
+
+UNLIMITED_REQUESTS = 10 ** 9
+RATE_LIMITED_REQUESTS_PER_HOUR = 10
+
+# Keep-alive HTTP/1.1 server answering /bytes/<n> with an n-byte JSON body,
+# on its own thread and event loop so it stays off the app's loop.
+class StubUpstream:
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self.port: Optional[int] = None
+        self._bodies: Dict[int, bytes] = {}
+        self._started = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name="stub-upstream", daemon=True).start()
+        self._started.wait()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        server = loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._started.set()
+        loop.run_forever()
+
+    def _body(self, path: str) -> bytes:
+        size = int(path.rsplit("/", 1)[-1]) if path.startswith("/bytes/") else 2
+        if size not in self._bodies:
+            self._bodies[size] = b'{"data":"' + b"x" * max(0, size - 11) + b'"}'
+        return self._bodies[size]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+
+                content_length = 0
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    if name.strip().lower() == "content-length":
+                        content_length = int(value)
+                if content_length:
+                    await reader.readexactly(content_length)
+
+                body = self._body(request_line.split(" ")[1])
+                if self.delay_seconds:
+                    await asyncio.sleep(self.delay_seconds)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: %d\r\n\r\n" % len(body)
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=SERVICE_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def seed(upstream_url: str) -> dict:
+    from app.core import database
+    from app.models.api import API
+    from app.models.rate_limit import RateLimit
+    from app.models.user import User
+    from app.services import api_key_service
+
+    database.init_db()
+    database.Base.metadata.create_all(bind=database.engine)
+
+    db = database.SessionLocal()
+    try:
+        user = User(
+            email=f"benchmark-{uuid.uuid4().hex[:12]}@example.com",
+            hashed_password="!",
+            full_name="Proxy Benchmark"
+        )
+        db.add(user)
+        db.flush()
+
+        apis = {}
+        for name, requests_per_hour in (("open", UNLIMITED_REQUESTS), ("limited", RATE_LIMITED_REQUESTS_PER_HOUR)):
+            api = API(user_id=user.id, name=f"benchmark-{name}", base_url=upstream_url, auth_type="none")
+            db.add(api)
+            db.flush()
+            db.add(RateLimit(
+                api_id=api.id,
+                tier="benchmark",
+                requests_per_hour=requests_per_hour,
+                requests_per_day=requests_per_hour
+            ))
+            apis[name] = api.id
+        db.commit()
+
+        _, full_key = api_key_service.create_api_key(db, user, name="benchmark")
+        return {"apis": apis, "api_key": full_key, "dialect": database.engine.dialect.name}
+    finally:
+        db.close()
+
+def build_scenarios(selected: List[str], payloads: List[int], concurrencies: List[int], apis: dict) -> List[dict]:
+    scenarios = []
+    small_payload = min(payloads)
+
+    for concurrency in concurrencies:
+        if "baseline" in selected:
+            for payload in payloads:
+                scenarios.append({
+                    "name": f"baseline/payload={payload}/c={concurrency}",
+                    "kind": "baseline", "api_id": apis["open"], "payload_bytes": payload,
+                    "concurrency": concurrency, "leasing": False,
+                })
+        for kind, leasing in (("cache-hit", True), ("cache-miss", False)):
+            if kind in selected:
+                scenarios.append({
+                    "name": f"{kind}/payload={small_payload}/c={concurrency}",
+                    "kind": kind, "api_id": apis["open"], "payload_bytes": small_payload,
+                    "concurrency": concurrency, "leasing": leasing,
+                })
+        if "rate-limited" in selected:
+            scenarios.append({
+                "name": f"rate-limited/payload={small_payload}/c={concurrency}",
+                "kind": "rate-limited", "api_id": apis["limited"], "payload_bytes": small_payload,
+                "concurrency": concurrency, "leasing": False,
+            })
+
+    return scenarios
+
+async def drive(client, url: str, headers: dict, total: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    errors: Counter = Counter()
+    issued = 0
+
+    async def worker():
+        nonlocal issued
+        while issued < total:
+            issued += 1
+            started = time.perf_counter()
+            try:
+                response = await client.get(url, headers=headers)
+                statuses[str(response.status_code)] += 1
+            except Exception as e:
+                errors[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    return {"latencies": latencies, "statuses": statuses, "errors": errors, "duration": duration}
+
+def summarize(latencies: List[float]) -> dict:
+    if len(latencies) < 2:
+        value = latencies[0] * 1000 if latencies else 0.0
+        return {"p50": value, "p95": value, "p99": value, "mean": value, "max": value}
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50": cuts[49] * 1000,
+        "p95": cuts[94] * 1000,
+        "p99": cuts[98] * 1000,
+        "mean": statistics.fmean(latencies) * 1000,
+        "max": max(latencies) * 1000,
+    }
+
+async def run_scenario(client, scenario: dict, api_key: str, requests: int, warmup: int) -> dict:
+    from app.config import get_settings
+    from app.services.quota_lease_service import quota_leases
+
+    settings = get_settings()
+    settings.RATE_LIMIT_LEASING_ENABLED = scenario["leasing"]
+    await quota_leases.release_all()
+
+    url = f"/proxy/{scenario['api_id']}/bytes/{scenario['payload_bytes']}"
+    headers = {"X-API-Key": api_key}
+
+    if warmup:
+        await drive(client, url, headers, warmup, scenario["concurrency"])
+    run = await drive(client, url, headers, requests, scenario["concurrency"])
+
+    return {
+        **{key: value for key, value in scenario.items() if key != "api_id"},
+        "requests": requests,
+        "duration_seconds": run["duration"],
+        "throughput_rps": requests / run["duration"],
+        "latency_ms": summarize(run["latencies"]),
+        "status_counts": dict(run["statuses"]),
+        "errors": dict(run["errors"]),
+    }
+
+def start_uvicorn(app):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="error"))
+    threading.Thread(target=server.run, name="uvicorn", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, server.servers[0].sockets[0].getsockname()[1]
+
+async def run(args) -> dict:
+    import httpx
+    from app.main import app
+    from app.services import event_bus_service
+    from app.services.redis_service import redis_service
+    from benchmarks import fakes
+
+    if args.redis == "fake":
+        fakes.install_redis(redis_service)
+    if args.events == "stub":
+        fakes.install_eventbridge(event_bus_service)
+
+    upstream = StubUpstream()
+    upstream.start()
+    seeded = seed(f"http://127.0.0.1:{upstream.port}")
+
+    scenarios = build_scenarios(args.scenarios, args.payloads, args.concurrency, seeded["apis"])
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    results = []
+
+    async def run_all(client):
+        for scenario in scenarios:
+            result = await run_scenario(client, scenario, seeded["api_key"], args.requests, args.warmup)
+            latency = result["latency_ms"]
+            print(
+                f"{result['name']:<40} {result['throughput_rps']:9.1f} req/s  "
+                f"p50 {latency['p50']:8.2f}  p95 {latency['p95']:8.2f}  p99 {latency['p99']:8.2f} ms  "
+                f"{result['status_counts']}"
+                + (f" errors={result['errors']}" if result["errors"] else "")
+            )
+            results.append(result)
+
+    if args.mode == "uvicorn":
+        server, port = start_uvicorn(app)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60.0) as client:
+            await run_all(client)
+        server.should_exit = True
+    else:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0) as client:
+                await run_all(client)
+
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "mode": args.mode,
+            "database": seeded["dialect"],
+            "redis": args.redis,
+            "events": args.events,
+            "requests_per_scenario": args.requests,
+            "warmup_per_scenario": args.warmup,
+        },
+        "scenarios": results,
+    }
+
+def compare(current: dict, baseline_path: str, max_regression_pct: Optional[float]) -> List[str]:
+    with open(baseline_path) as f:
+        baseline = {scenario["name"]: scenario for scenario in json.load(f)["scenarios"]}
+
+    print(f"\nCompared with {baseline_path}:")
+    print(f"{'scenario':<40} {'throughput':>11} {'p95':>9} {'p99':>9}")
+
+    regressions = []
+    for scenario in current["scenarios"]:
+        previous = baseline.get(scenario["name"])
+        if previous is None:
+            continue
+
+        throughput_change = (scenario["throughput_rps"] / previous["throughput_rps"] - 1) * 100
+        p95_change = (scenario["latency_ms"]["p95"] / previous["latency_ms"]["p95"] - 1) * 100
+        p99_change = (scenario["latency_ms"]["p99"] / previous["latency_ms"]["p99"] - 1) * 100
+        print(f"{scenario['name']:<40} {throughput_change:+10.1f}% {p95_change:+8.1f}% {p99_change:+8.1f}%")
+
+        if max_regression_pct is not None and (-throughput_change > max_regression_pct or p95_change > max_regression_pct):
+            regressions.append(
+                f"{scenario['name']}: throughput {throughput_change:+.1f}%, p95 {p95_change:+.1f}%"
+            )
+
+    return regressions
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+def parse_scenarios(value: str) -> List[str]:
+    selected = [item for item in value.split(",") if item]
+    unknown = set(selected) - set(SCENARIOS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return selected
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency of /proxy/{api_id}/{path} against a stub upstream")
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--redis", choices=("fake", "real"), default="fake",
+                        help="'real' connects to REDIS_HOST/REDIS_PORT")
+    parser.add_argument("--events", choices=("stub", "aws"), default="stub",
+                        help="'aws' publishes proxy events to the real EventBridge bus")
+    parser.add_argument("--scenarios", type=parse_scenarios, default=list(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--payloads", type=parse_ints, default=[1024, 65536, 1048576],
+                        help="Comma-separated upstream response sizes in bytes")
+    parser.add_argument("--concurrency", type=parse_ints, default=[1, 8, 32],
+                        help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    parser.add_argument("--max-regression-pct", type=float,
+                        help="With --compare, exit non-zero when throughput drops or p95 grows by more than this")
+    args = parser.parse_args()
+
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='proxy-benchmark-')}/benchmark.db"
+
+    if SERVICE_ROOT not in sys.path:
+        sys.path.insert(0, SERVICE_ROOT)
+
+    results = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_regression_pct)
+        for regression in regressions:
+            print(f"FAIL: regression in {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
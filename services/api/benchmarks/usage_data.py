@@ -0,0 +1,218 @@
+import argparse
+import csv
+import io
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Tuple
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REQUIRED_ENV = {
+    "REDIS_HOST": "localhost",
+    "JWT_SECRET_KEY": "usage-data",
+}
+
+SYNTHETIC_USER_EMAIL = "synthetic-usage@apiverse.local"
+
+RESOURCES = ("users", "orders", "products", "payments", "invoices", "search", "sessions", "carts", "reviews", "inventory")
+SUFFIXES = ("", "/{id}", "/{id}/items", "/{id}/history", "/bulk")
+METHODS = (("GET", 0.70), ("POST", 0.18), ("PUT", 0.07), ("DELETE", 0.05))
+
+# Roughly what a healthy public API sees: mostly 2xx, a long tail of client
+# errors, and rare upstream failures.
+STATUS_DISTRIBUTION = (
+    (200, 0.880), (201, 0.040), (204, 0.015),
+    (400, 0.020), (401, 0.010), (403, 0.004), (404, 0.015), (429, 0.006),
+    (500, 0.006), (502, 0.002), (503, 0.001), (504, 0.001),
+)
+
+# Relative request volume per hour of day (UTC), peaking mid-afternoon.
+DIURNAL_WEIGHTS = tuple(1.0 + 0.8 * math.sin((hour - 8) / 24 * 2 * math.pi) for hour in range(24))
+
+COPY_COLUMNS = ("api_id", "endpoint", "method", "status_code", "response_time_ms", "http_version", "timestamp")
+
+def zipf_cum_weights(n: int, exponent: float) -> List[float]:
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+
+def endpoint_catalog(count: int, rng: random.Random) -> List[Tuple[str, str, float]]:
+    methods, method_weights = zip(*METHODS)
+    catalog = []
+    for i in range(count):
+        path = f"/v{1 + i // (len(RESOURCES) * len(SUFFIXES))}/{RESOURCES[i % len(RESOURCES)]}{SUFFIXES[(i // len(RESOURCES)) % len(SUFFIXES)]}"
+        method = rng.choices(methods, weights=method_weights)[0]
+        median_ms = rng.lognormvariate(math.log(80), 0.8)
+        catalog.append((path, method, median_ms))
+    return catalog
+
+def response_time_ms(status_code: int, median_ms: float, rng: random.Random) -> float:
+    if status_code == 504:
+        return 30000 + rng.uniform(0, 500)
+    if status_code == 429:
+        return rng.lognormvariate(math.log(2), 0.3)
+    if status_code in (401, 403):
+        return rng.lognormvariate(math.log(5), 0.4)
+    return median_ms * rng.lognormvariate(0, 0.5)
+
+def generate_rows(
+    api_ids: List[int],
+    rows: int,
+    endpoints: int,
+    zipf_exponent: float,
+    start: datetime,
+    days: int,
+    seed: int,
+    batch_size: int
+) -> Iterator[List[tuple]]:
+    rng = random.Random(seed)
+    catalogs: Dict[int, List[Tuple[str, str, float]]] = {api_id: endpoint_catalog(endpoints, rng) for api_id in api_ids}
+
+    api_cum_weights = zipf_cum_weights(len(api_ids), zipf_exponent)
+    endpoint_ranks = range(endpoints)
+    endpoint_cum_weights = zipf_cum_weights(endpoints, zipf_exponent)
+    statuses, status_weights = zip(*STATUS_DISTRIBUTION)
+    status_cum_weights = list(itertools.accumulate(status_weights))
+    hour_cum_weights = list(itertools.accumulate(DIURNAL_WEIGHTS))
+    start_ts = start.timestamp()
+
+    remaining = rows
+    while remaining > 0:
+        k = min(batch_size, remaining)
+        remaining -= k
+
+        batch_apis = rng.choices(api_ids, cum_weights=api_cum_weights, k=k)
+        batch_ranks = rng.choices(endpoint_ranks, cum_weights=endpoint_cum_weights, k=k)
+        batch_statuses = rng.choices(statuses, cum_weights=status_cum_weights, k=k)
+        batch_hours = rng.choices(range(24), cum_weights=hour_cum_weights, k=k)
+
+        batch = []
+        for api_id, rank, status_code, hour in zip(batch_apis, batch_ranks, batch_statuses, batch_hours):
+            path, method, median_ms = catalogs[api_id][rank]
+            offset = rng.randrange(days) * 86400 + hour * 3600 + rng.random() * 3600
+            batch.append((
+                api_id,
+                path,
+                method,
+                status_code,
+                round(response_time_ms(status_code, median_ms, rng), 3),
+                "HTTP/1.1",
+                datetime.fromtimestamp(start_ts + offset, tz=timezone.utc),
+            ))
+        yield batch
+
+def ensure_synthetic_apis(db, count: int) -> List[int]:
+    from app.models.api import API
+    from app.models.user import User
+
+    user = db.query(User).filter(User.email == SYNTHETIC_USER_EMAIL).first()
+    if user is None:
+        user = User(email=SYNTHETIC_USER_EMAIL, hashed_password="!", full_name="Synthetic Usage", is_active=False)
+        db.add(user)
+        db.flush()
+
+    api_ids = [api_id for (api_id,) in db.query(API.id).filter(API.user_id == user.id).order_by(API.id)]
+    for i in range(len(api_ids), count):
+        api = API(user_id=user.id, name=f"synthetic-api-{i + 1}", base_url="https://synthetic.invalid", auth_type="none")
+        db.add(api)
+        db.flush()
+        api_ids.append(api.id)
+
+    db.commit()
+    return api_ids[:count]
+
+def copy_batch(cursor, batch: List[tuple]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow(row[:-1] + (row[-1].isoformat(),))
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY usage_metrics ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+def load(args):
+    from sqlalchemy import insert, text
+    from app.core import database
+    from app.models.usage_metric import UsageMetric
+
+    database.init_db()
+    database.Base.metadata.create_all(bind=database.engine)
+    dialect = database.engine.dialect.name
+
+    db = database.SessionLocal()
+    try:
+        api_ids = ensure_synthetic_apis(db, args.apis)
+    finally:
+        db.close()
+
+    if args.truncate:
+        with database.engine.begin() as connection:
+            connection.execute(
+                text("DELETE FROM usage_metrics WHERE api_id IN (SELECT id FROM apis WHERE user_id = "
+                     "(SELECT id FROM users WHERE email = :email))"),
+                {"email": SYNTHETIC_USER_EMAIL}
+            )
+
+    end = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    start = end - timedelta(days=args.days)
+    batches = generate_rows(api_ids, args.rows, args.endpoints, args.zipf_exponent, start, args.days, args.seed, args.batch_size)
+
+    started = time.perf_counter()
+    written = 0
+
+    if dialect == "postgresql":
+        connection = database.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            for batch in batches:
+                copy_batch(cursor, batch)
+                connection.commit()
+                written += len(batch)
+                report(written, args.rows, started)
+        finally:
+            connection.close()
+    else:
+        with database.engine.begin() as connection:
+            for batch in batches:
+                connection.execute(insert(UsageMetric), [dict(zip(COPY_COLUMNS, row)) for row in batch])
+                written += len(batch)
+                report(written, args.rows, started)
+
+    if dialect == "postgresql":
+        with database.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("ANALYZE usage_metrics"))
+
+    elapsed = time.perf_counter() - started
+    print(f"\nLoaded {written} rows for API ids {api_ids[0]}..{api_ids[-1]} "
+          f"({start:%Y-%m-%d %H:%M} to {end:%Y-%m-%d %H:%M} UTC) in {elapsed:.1f} s, {written / elapsed:.0f} rows/s")
+
+def report(written: int, total: int, started: float):
+    elapsed = time.perf_counter() - started
+    print(f"\r{written}/{total} rows, {written / elapsed:.0f} rows/s", end="", flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load synthetic usage_metrics rows for analytics benchmarks")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--apis", type=int, default=20)
+    parser.add_argument("--endpoints", type=int, default=200, help="Endpoints per API")
+    parser.add_argument("--days", type=int, default=30, help="Length of the window the rows are spread over, ending now")
+    parser.add_argument("--zipf-exponent", type=float, default=1.1, help="Skew of API and endpoint popularity")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--truncate", action="store_true", help="Delete previously generated rows first")
+    args = parser.parse_args()
+
+    for key, value in REQUIRED_ENV.items():
+        os.environ.setdefault(key, value)
+    if SERVICE_ROOT not in sys.path:
+        sys.path.insert(0, SERVICE_ROOT)
+
+    load(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARK_ENV = {
+    "REDIS_HOST": "localhost",
+    "JWT_SECRET_KEY": "webhook-benchmark",
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "LOG_LEVEL": "ERROR",
+}
+
+EVENT_TYPE = "usage_threshold"
+QUEUE_ARN = "arn:aws:sqs:us-east-1:000000000000:apiverse-webhook-queue"
+
+# Nothing listens here, so deliveries fail with a connection error and their
+# messages are reported back in batchItemFailures.
+UNREACHABLE_URL = "http://127.0.0.1:9/unreachable"
+
+# Shaped like what the EventBridge rule puts on the webhook queue: the event
+# envelope as the SQS body, with webhook_service's event as its detail.
+def synthetic_event(api_id: int, batch_size: int) -> dict:
+    records = []
+    for sequence in range(batch_size):
+        detail = {
+            "event_type": EVENT_TYPE,
+            "api_id": api_id,
+            "payload": {"sequence": sequence, "usage_percent": 80},
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        records.append({
+            "messageId": str(uuid.uuid4()),
+            "receiptHandle": "synthetic",
+            "body": json.dumps({
+                "version": "0",
+                "id": str(uuid.uuid4()),
+                "detail-type": EVENT_TYPE,
+                "source": "apiverse",
+                "time": detail["timestamp"],
+                "detail": detail,
+            }),
+            "attributes": {"ApproximateReceiveCount": "1"},
+            "messageAttributes": {},
+            "eventSource": "aws:sqs",
+            "eventSourceARN": QUEUE_ARN,
+            "awsRegion": "us-east-1",
+        })
+    return {"Records": records}
+
+def seed(receiver_url: str, subscriptions: int, failing_subscriptions: int) -> int:
+    from app.core import database
+    from app.models.api import API
+    from app.models.user import User
+    from app.models.webhook_subscription import WebhookSubscription
+
+    database.init_db()
+    database.Base.metadata.create_all(bind=database.engine)
+
+    db = database.SessionLocal()
+    try:
+        user = User(
+            email=f"webhook-benchmark-{uuid.uuid4().hex[:12]}@example.com",
+            hashed_password="!",
+            full_name="Webhook Benchmark"
+        )
+        db.add(user)
+        db.flush()
+
+        api = API(user_id=user.id, name="webhook-benchmark", base_url=receiver_url, auth_type="none")
+        db.add(api)
+        db.flush()
+
+        urls = [f"{receiver_url}/hooks/{i}" for i in range(subscriptions)] + [UNREACHABLE_URL] * failing_subscriptions
+        for url in urls:
+            db.add(WebhookSubscription(
+                user_id=user.id,
+                api_id=api.id,
+                url=url,
+                secret=uuid.uuid4().hex,
+                events=[EVENT_TYPE]
+            ))
+        db.commit()
+        return api.id
+    finally:
+        db.close()
+
+def run(args) -> dict:
+    from app.main import handler
+    from benchmarks.proxy_load import StubUpstream
+
+    receiver = StubUpstream(delay_seconds=args.receiver_delay_ms / 1000)
+    receiver.start()
+    api_id = seed(f"http://127.0.0.1:{receiver.port}", args.subscriptions, args.failing_subscriptions)
+    deliveries_per_message = args.subscriptions + args.failing_subscriptions
+
+    handler(synthetic_event(api_id, 1), None)
+
+    results = []
+    for batch_size in args.batch_sizes:
+        samples = []
+        failures = 0
+        for _ in range(args.repeat):
+            event = synthetic_event(api_id, batch_size)
+            started = time.perf_counter()
+            response = handler(event, None)
+            samples.append(time.perf_counter() - started)
+            failures = len(response["batchItemFailures"])
+
+        median = statistics.median(samples)
+        result = {
+            "batch_size": batch_size,
+            "median_ms": median * 1000,
+            "messages_per_second": batch_size / median,
+            "deliveries_per_second": batch_size * deliveries_per_message / median,
+            "batch_item_failures": failures,
+        }
+        print(
+            f"batch {batch_size:>5}  {result['median_ms']:9.1f} ms  "
+            f"{result['messages_per_second']:9.1f} msg/s  {result['deliveries_per_second']:9.1f} deliveries/s  "
+            f"failures {failures}"
+        )
+        results.append(result)
+
+    return {
+        "metadata": {
+            "subscriptions": args.subscriptions,
+            "failing_subscriptions": args.failing_subscriptions,
+            "receiver_delay_ms": args.receiver_delay_ms,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item]
+
+def main():
+    parser = argparse.ArgumentParser(description="Feed SQS webhook batches through app.main.handler")
+    parser.add_argument("--event", help="Process this SQS event JSON file and print the handler response")
+    parser.add_argument("--dump-event", help="Write a synthetic SQS event for --api-id to this path and exit")
+    parser.add_argument("--api-id", type=int, default=1, help="API id used by --dump-event")
+    parser.add_argument("--batch-sizes", type=parse_ints, default=[1, 10, 50, 100])
+    parser.add_argument("--subscriptions", type=int, default=5, help="Subscriptions per event delivered to a stub receiver")
+    parser.add_argument("--failing-subscriptions", type=int, default=0, help="Subscriptions pointing at an unreachable URL")
+    parser.add_argument("--receiver-delay-ms", type=float, default=50.0, help="Stub receiver response time")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.dump_event:
+        with open(args.dump_event, "w") as f:
+            json.dump(synthetic_event(args.api_id, args.batch_sizes[0]), f, indent=2)
+        return
+
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+    if "DATABASE_URL" not in os.environ and not args.event:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='webhook-benchmark-')}/benchmark.db"
+
+    if SERVICE_ROOT not in sys.path:
+        sys.path.insert(0, SERVICE_ROOT)
+
+    if args.event:
+        from app.main import handler
+
+        with open(args.event) as f:
+            print(json.dumps(handler(json.load(f), None), indent=2))
+        return
+
+    results = run(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()